@@ -1,22 +1,54 @@
-import jira
+import bisect
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 
-try:
-    from importlib.metadata import version, PackageNotFoundError
-except ImportError:
-    from importlib_metadata import version, PackageNotFoundError  # type: ignore
+from jira_agile_toolbox.aggregation import DIMENSIONS, SPRINT_FIELD_NAME, aggregate, input_validation_group_by
+from jira_agile_toolbox.single_flight import SingleFlight
 
-try:
-    __version__ = version("jira_agile_toolbox")
-except PackageNotFoundError:
-    __version__ = "unknown"
+DEFAULT_MAX_WORKERS = 10
+EPICS_PER_SEARCH = 50
+DEFAULT_PAGE_SIZE = 100
+RANK_FIELD_NAME = "Rank"
+ISSUES_PER_SPRINT_MOVE = 50
+# the backlog leaves out finished issues and issues which are already planned in an active or future sprint
+BACKLOG_QUERY = "statusCategory != Done AND (sprint is EMPTY OR sprint not in (openSprints(), futureSprints()))"
+
+
+def __getattr__(name):
+    # the version lookup is deferred so importing the package (e.g. for the jat command line) stays fast
+    if name == "__version__":
+        try:
+            from importlib.metadata import version, PackageNotFoundError
+        except ImportError:
+            from importlib_metadata import version, PackageNotFoundError  # type: ignore
+
+        try:
+            return version("jira_agile_toolbox")
+        except PackageNotFoundError:
+            return "unknown"
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _is_jira_issue(item):
+    # jira is imported lazily, it is by far the slowest part of importing this package
+    import jira
+
+    return isinstance(item, jira.Issue)
 
 
 class JiraAgileToolBox:
     """
     a class which helps you do agile things with jira
 
+    one toolbox can be shared by many threads, identical searches which run at the same time are sent to jira only once
+
     :param jira_client: an instance of jira.JIRA
     :type jira_client: jira.JIRA
+    :param max_workers: the number of concurrent calls the toolbox may make to jira (defaults to 10)
+    :type max_workers: int
+    :param cache: reuses the results of :meth:`get_all_issues_in_epic` (and the methods built on it) until they expire or are
+        invalidated, the labels, fixVersions and rank methods invalidate the epics they change
+    :type cache: jira_agile_toolbox.cache.EpicCache
 
 
     ``Example``
@@ -27,12 +59,64 @@ class JiraAgileToolBox:
             >>> jira_client = JIRA("https://jira.atlassian.org")
             >>> jat = JiraAgileToolBox(jira_client)
 
+    or let the toolbox create a client with a connection pool sized to its concurrency
+
+        .. code-block:: python
+
+            >>> jat = JiraAgileToolBox.from_server("https://jira.atlassian.org", max_workers=20, basic_auth=("MYUSERNAME","MYPASSWORD"))
+
     """
 
-    def __init__(self, jira_client):
+    def __init__(self, jira_client, max_workers=DEFAULT_MAX_WORKERS, cache=None):
         self._jira_client = jira_client
+        self._max_workers = max_workers
+        self._cache = cache
         self._story_points_custom_field = None
         self._story_points_custom_field_name = "Story Points"
+        self._project_versions = {}
+        self._custom_fields = {}
+        self._project_statuses = {}
+        self._rank_indexes = {}
+        self._single_flight = SingleFlight()
+
+    @classmethod
+    def from_server(cls, server, max_workers=DEFAULT_MAX_WORKERS, **jira_kwargs):
+        """
+        creates a toolbox and its jira client, the client keeps up to max_workers connections alive and accepts compressed responses
+
+        :param server: the url of the jira server
+        :type server: str
+        :param max_workers: the number of concurrent calls the toolbox may make to jira (defaults to 10)
+        :type max_workers: int
+        :param jira_kwargs: passed on to jira.JIRA e.g. basic_auth or token_auth
+        :return: a JiraAgileToolBox
+        :rtype: JiraAgileToolBox
+        """
+        from jira_agile_toolbox.transport import build_jira_client
+
+        return cls(build_jira_client(server, max_workers=max_workers, **jira_kwargs), max_workers=max_workers)
+
+    def transport_stats(self):
+        """
+        returns the connection pool statistics of the jira client
+
+        :return: a dictionary with the number of requests sent, connections opened and reused, and how many requests found
+            the pool exhausted or None when the client was not created via :meth:`from_server`
+        :rtype: dict
+
+        ``Example``
+
+            .. code-block:: python
+
+                >>> tb = JiraAgileToolBox.from_server("https://my-jira-server.com", basic_auth=("MYUSERNAME","MYPASSWORD"))
+                >>> tb.get_storypoints_from_epic("JAT-001")
+                >>> tb.transport_stats()
+                {'pool_size': 10, 'requests': 3, 'connections_opened': 1, 'connections_reused': 2, 'pool_exhausted': 0}
+        """
+        from jira_agile_toolbox.transport import get_pooled_adapter
+
+        adapter = get_pooled_adapter(getattr(self._jira_client, "_session", None))
+        return adapter.stats() if adapter else None
 
     def get_storypoints_from_epic(self, epic, jql_query=""):
         """
@@ -57,8 +141,7 @@ def get_storypoints_from_epic(self, epic, jql_query=""):
                 {'total': 100, "Reported": 50, "Closed": 50}
 
         """
-        if not self._story_points_custom_field:
-            self._story_points_custom_field = self._get_custom_field_from_name(self._story_points_custom_field_name)
+        self._get_story_points_custom_field()
 
         fields_to_get = [self._story_points_custom_field, "status"]
         issues_in_epic = self.get_all_issues_in_epic(epic, fields_to_get, jql_query=jql_query)
@@ -78,6 +161,102 @@ def get_storypoints_from_epic(self, epic, jql_query=""):
         sum_of_story_points_per_state["total"] = sum_of_story_points
         return sum_of_story_points_per_state
 
+    def get_storypoints_from_epics(self, epics, jql_query="", processes=None, page_size=DEFAULT_PAGE_SIZE):
+        """
+        returns the story points per status of every epic, the same as calling get_storypoints_from_epic for each of them
+
+        meant for reports over thousands of epics: the search pages are downloaded as raw json by max_workers threads and
+        decoded and summed by a pool of processes, so the work is spread over all cores of the client
+
+        :param epics: epic keys as strings or epics as jira.Issue
+        :type epics: list
+        :param jql_query: a query of the form 'project in (PROJ001,PROJ002)' or 'issuetype not in ('Task') AND status != Closed' will be AND'ed after the autogenerated search
+        :type jql_query: str
+        :param processes: the number of processes decoding the pages (defaults to the number of cpus)
+        :type processes: int
+        :param page_size: the number of issues to fetch per request
+        :type page_size: int
+        :return: a dictionary with per epic key a dictionary containing the total story points and the story points per status
+        :rtype: dict
+
+        ``Example``
+
+            .. code-block:: python
+
+                >>> from jira_agile_toolbox import JiraAgileToolBox
+                >>> tb = JiraAgileToolBox.from_server("https://my-jira-server.com", basic_auth=("MYUSERNAME","MYPASSWORD"))
+                >>> tb.get_storypoints_from_epics(["JAT-001", "JAT-002"])
+                {'JAT-001': {'total': 100, "Reported": 50, "Closed": 50}, 'JAT-002': {'total': 8, "Reported": 8}}
+        """
+        from jira_agile_toolbox.portfolio import sum_story_points_per_epic
+
+        story_points_field = self._get_story_points_custom_field()
+        epic_keys = list(dict.fromkeys(epic.key if _is_jira_issue(epic) else epic for epic in epics))
+        # pages are fetched concurrently by their start index, a fixed order keeps them from overlapping
+        searches = {
+            epic_key: (
+                f"'parentEpic' = {epic_key} AND {jql_query} ORDER BY key ASC"
+                if jql_query
+                else f"'parentEpic' = {epic_key} ORDER BY key ASC"
+            )
+            for epic_key in epic_keys
+        }
+        return sum_story_points_per_epic(
+            lambda epic_key: self._count_issues(searches[epic_key]),
+            lambda epic_key, start_at, max_results: self._get_raw_search_page(
+                searches[epic_key], start_at, max_results, [story_points_field, "status"]
+            ),
+            epic_keys,
+            story_points_field,
+            page_size,
+            self._max_workers,
+            processes,
+        )
+
+    def get_aggregations_from_epic(self, epic, group_by, metrics=None, jql_query=""):
+        """
+        searches for the epic once and returns the number of issues and the sum of the metrics per group for every grouping
+
+        :param epic: and epic key as a string or the epic as a jira.Issue
+        :type epic: str jira.Issue
+        :param group_by: a dimension or a list of dimensions and/or tuples of dimensions out of "status", "assignee", "issuetype", "component" and "sprint"
+        :type group_by: str list
+        :param metrics: the name or names of number fields to sum e.g. ["Story Points"]
+        :type metrics: str list
+        :param jql_query: a query of the form 'project in (PROJ001,PROJ002)' or 'issuetype not in ('Task') AND status != Closed' will be AND'ed after the autogenerated search
+        :type jql_query: str
+        :return: per grouping a dictionary with the count and metrics per group and the "total" over all issues
+        :rtype: dict
+
+        ``Example``
+
+            .. code-block:: python
+
+                >>> from jira_agile_toolbox import JiraAgileToolBox
+                >>> from jira import JIRA
+                >>> my_jira_client = JIRA("https://my-jira-server.com", basic_auth=("MYUSERNAME","MYPASSWORD")
+                >>> tb = JiraAgileToolBox(my_jira_client)
+                >>> tb.get_aggregations_from_epic("JAT-001", ["assignee", ("status", "sprint")], metrics=["Story Points"])
+                {'assignee': {'Jef Neefs': {'count': 3, 'Story Points': 8}, None: {'count': 1, 'Story Points': 2}},
+                 ('status', 'sprint'): {('Closed', 'Sprint 1'): {'count': 2, 'Story Points': 5}, ('Reported', None): {'count': 2, 'Story Points': 5}},
+                 'total': {'count': 4, 'Story Points': 10}}
+
+            issues in several sprints or components count for each of them, issues without a value count under None
+        """
+        cubes = input_validation_group_by(group_by)
+        dimension_fields = {}
+        for dimension in dict.fromkeys(dimension for cube in cubes for dimension in cube):
+            dimension_fields[dimension] = DIMENSIONS[dimension][0] or self._get_custom_field_from_name(SPRINT_FIELD_NAME)
+        metrics = [metrics] if isinstance(metrics, str) else metrics or []
+        metric_fields = {metric: self._get_custom_field_from_name(metric) for metric in metrics}
+        unknown_fields = [name for name, field in [*dimension_fields.items(), *metric_fields.items()] if not field]
+        if unknown_fields:
+            raise ValueError(f"no fields found for {', '.join(unknown_fields)}")
+
+        fields_to_get = list(dict.fromkeys([*dimension_fields.values(), *metric_fields.values()]))
+        issues_in_epic = self.get_all_issues_in_epic(epic, fields_to_get, jql_query=jql_query)
+        return aggregate(issues_in_epic, cubes, dimension_fields, metric_fields)
+
     def get_all_issues_in_epic(self, epic, fields=None, jql_query=""):
         """
         gets all 'Issues in Epic' as a list
@@ -103,11 +282,181 @@ def get_all_issues_in_epic(self, epic, fields=None, jql_query=""):
                 [<JIRA Issue: key='JAT-002', id='67'>, <JIRA Issue: key='JAT-003', id='68'>, <JIRA Issue: key='JAT-004', id='69'>]
         """
         fields_to_get = self._input_validation_fields(fields)
-        epic_key = epic.key if isinstance(epic, jira.Issue) else epic
+        epic_key = epic.key if _is_jira_issue(epic) else epic
+        if self._cache is not None:
+            cached_issues = self._cache.get(epic_key, fields_to_get, jql_query)
+            if cached_issues is not None:
+                return cached_issues
         jql_query_to_find_the_issues = f"'parentEpic' = {epic_key} AND {jql_query}" if jql_query else f"'parentEpic' = {epic_key}"
-        if fields_to_get:
-            return self._jira_client.search_issues(jql_query_to_find_the_issues, fields=fields_to_get, maxResults=0)
-        return self._jira_client.search_issues(jql_query_to_find_the_issues, maxResults=0)
+        if self._cache is None:
+            return self._search_issues_in_epic(jql_query_to_find_the_issues, fields_to_get)
+        generation = self._cache.start_search()
+        try:
+            issues = self._search_issues_in_epic(jql_query_to_find_the_issues, fields_to_get, generation=generation)
+            self._cache.put(epic_key, fields_to_get, jql_query, issues, generation=generation)
+        finally:
+            self._cache.end_search()
+        return issues
+
+    def _search_issues_in_epic(self, jql_query, fields, generation=None):
+        if fields:
+            return self._search_issues(jql_query, generation=generation, fields=fields, maxResults=0)
+        return self._search_issues(jql_query, generation=generation, maxResults=0)
+
+    def count_issues_in_epic(self, epic, jql_query=""):
+        """
+        returns the number of 'Issues in Epic' without downloading the issues
+
+        :param epic: and epic key as a string or the epic as a jira.Issue
+        :type epic: str jira.Issue
+        :param jql_query: a query of the form 'project in (PROJ001,PROJ002)' or 'issuetype not in ('Task') AND status != Closed' will be AND'ed after the autogenerated search
+        :type jql_query: str
+        :return: the number of issues
+        :rtype: int
+
+        ``Example``
+
+            .. code-block:: python
+
+                >>> from jira_agile_toolbox import JiraAgileToolBox
+                >>> from jira import JIRA
+                >>> my_jira_client = JIRA("https://my-jira-server.com", basic_auth=("MYUSERNAME","MYPASSWORD")
+                >>> tb = JiraAgileToolBox(my_jira_client)
+                >>> tb.count_issues_in_epic("JAT-001", jql_query="status != Closed")
+                12
+        """
+        epic_key = epic.key if _is_jira_issue(epic) else epic
+        return self._count_issues(f"'parentEpic' = {epic_key} AND {jql_query}" if jql_query else f"'parentEpic' = {epic_key}")
+
+    def count_issues_in_epic_by_status(self, epic, jql_query="", projects=None):
+        """
+        returns the number of 'Issues in Epic' per status without downloading the issues
+
+        one tiny search per status of the project(s) runs concurrently and only the total of each search is read
+
+        :param epic: and epic key as a string or the epic as a jira.Issue
+        :type epic: str jira.Issue
+        :param jql_query: a query of the form 'project in (PROJ001,PROJ002)' or 'issuetype not in ('Task') AND status != Closed' will be AND'ed after the autogenerated search
+        :type jql_query: str
+        :param projects: the project key or keys whose statuses are counted (defaults to the project of the epic)
+        :type projects: str list
+        :return: a dictionary containing the total and the number of issues per status, statuses without issues are left out
+        :rtype: dict
+
+        ``Example``
+
+            .. code-block:: python
+
+                >>> from jira_agile_toolbox import JiraAgileToolBox
+                >>> from jira import JIRA
+                >>> my_jira_client = JIRA("https://my-jira-server.com", basic_auth=("MYUSERNAME","MYPASSWORD")
+                >>> tb = JiraAgileToolBox(my_jira_client)
+                >>> tb.count_issues_in_epic_by_status("JAT-001")
+                {'total': 20, 'Reported': 12, 'Closed': 8}
+        """
+        epic_key = epic.key if _is_jira_issue(epic) else epic
+        projects = [projects] if isinstance(projects, str) else projects or [epic_key.rsplit("-", 1)[0]]
+        statuses = list(dict.fromkeys(status for project in projects for status in self._get_project_statuses(project)))
+        epic_query = f"'parentEpic' = {epic_key}"
+        queries = [f'{epic_query} AND status = "{status}"' for status in statuses] + [epic_query]
+        if jql_query:
+            queries = [f"{query} AND {jql_query}" for query in queries]
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            counts = list(executor.map(self._count_issues, queries))
+
+        count_per_status = {status: count for status, count in zip(statuses, counts) if count}
+        count_per_status["total"] = counts[-1]
+        return count_per_status
+
+    def _count_issues(self, jql_query):
+        # only the total of the result is used, a single key is the smallest page jira can return with json_result
+        return self._search_issues(jql_query, fields=["key"], maxResults=1, json_result=True)["total"]
+
+    def _search_issues(self, jql_query, generation=None, **kwargs):
+        """
+        helper method which calls search_issues, threads running the same search at the same time share one request
+
+        :param jql_query: the complete jql query
+        :param generation: the cache generation the search started at, a search started after an invalidation never shares
+            the request of a search which started before it
+        :param kwargs: passed on to search_issues
+        """
+        key = (
+            "search",
+            generation,
+            jql_query,
+            *sorted((name, tuple(value) if isinstance(value, list) else value) for name, value in kwargs.items()),
+        )
+        return self._single_flight.do(key, self._jira_client.search_issues, jql_query, **kwargs)
+
+    def _get_raw_search_page(self, jql_query, start_at, max_results, fields):
+        """
+        helper method which returns one search page as the undecoded json bytes jira sent
+
+        :param jql_query: the complete jql query
+        :param start_at: the index of the first issue
+        :param max_results: the number of issues per page
+        :param fields: the fields to get
+        """
+        params = {"jql": jql_query, "startAt": start_at, "maxResults": max_results, "fields": ",".join(fields)}
+        return self._jira_client._session.get(self._jira_client._get_url("search"), params=params).content
+
+    def _get_project_statuses(self, project):
+        """
+        helper method to get the names of all statuses used in a project
+
+        :param project: the project key
+        """
+        if project not in self._project_statuses:
+            self._single_flight.do(("statuses", project), self._load_project_statuses, project)
+        return self._project_statuses[project]
+
+    def _load_project_statuses(self, project):
+        statuses = (status.name for issue_type in self._jira_client.issue_types_for_project(project) for status in issue_type.statuses)
+        self._project_statuses[project] = list(dict.fromkeys(statuses))
+
+    def get_all_issues_in_epics(self, epics, fields=None, jql_query=""):
+        """
+        gets all 'Issues in Epic' of several epics as one list, searching for up to 50 epics at once
+
+        issues which are found under more than one epic are only returned once
+
+        :param epics: a list of epic keys as strings or epics as jira.Issue
+        :type epics: list
+        :param fields: a string or list of strings to limit the fields to get this helps to lower the amount of data to be sent around
+        :type fields: str list
+        :param jql_query: a query of the form 'project in (PROJ001,PROJ002)' or 'issuetype not in ('Task') AND status != Closed' will be AND'ed after the autogenerated search
+        :type jql_query: str
+        :return: a list of jira.Issues
+        :rtype: list
+
+        ``Example``
+
+            .. code-block:: python
+
+                >>> from jira_agile_toolbox import JiraAgileToolBox
+                >>> from jira import JIRA
+                >>> my_jira_client = JIRA("https://my-jira-server.com", basic_auth=("MYUSERNAME","MYPASSWORD")
+                >>> tb = JiraAgileToolBox(my_jira_client)
+                >>> tb.get_all_issues_in_epics(["JAT-001", "JAT-010"])
+                [<JIRA Issue: key='JAT-002', id='67'>, <JIRA Issue: key='JAT-003', id='68'>, <JIRA Issue: key='JAT-011', id='76'>]
+        """
+        fields_to_get = self._input_validation_fields(fields)
+        epic_keys = list(dict.fromkeys(epic.key if _is_jira_issue(epic) else epic for epic in epics))
+        issues_by_key = {}
+        for start in range(0, len(epic_keys), EPICS_PER_SEARCH):
+            epic_keys_in_search = ",".join(epic_keys[start : start + EPICS_PER_SEARCH])
+            jql_query_to_find_the_issues = (
+                f"'parentEpic' in ({epic_keys_in_search}) AND {jql_query}" if jql_query else f"'parentEpic' in ({epic_keys_in_search})"
+            )
+            if fields_to_get:
+                found_issues = self._search_issues(jql_query_to_find_the_issues, fields=fields_to_get, maxResults=0)
+            else:
+                found_issues = self._search_issues(jql_query_to_find_the_issues, maxResults=0)
+            for issue in found_issues:
+                issues_by_key.setdefault(issue.key, issue)
+        return list(issues_by_key.values())
 
     def _input_validation_fields(self, fields):
         fields_to_get = []
@@ -126,22 +475,46 @@ def _input_validation_fields(self, fields):
             raise ValueError("fields should be a string or a list")
         return fields_to_get
 
+    def _get_story_points_custom_field(self):
+        if not self._story_points_custom_field:
+            self._story_points_custom_field = self._get_custom_field_from_name(self._story_points_custom_field_name)
+        return self._story_points_custom_field
+
+    def _get_issues_by_keys(self, keys, fields="key"):
+        """
+        helper method to get issues in the order of the given keys
+
+        :param keys: a list of issue keys
+        :raises ValueError: when not all issues are found
+        """
+        found = {issue.key: issue for issue in self._jira_client.search_issues(f"key in ({','.join(keys)})", fields=fields, maxResults=0)}
+        missing = [key for key in keys if key not in found]
+        if missing:
+            raise ValueError(f"issues not found: {', '.join(missing)}")
+        return [found[key] for key in keys]
+
     def _get_custom_field_from_name(self, name):
         """
         helper method to find custom fields
 
         :param name: name of the field you want the "customxxxxx" value from
         """
+        if name not in self._custom_fields:
+            self._single_flight.do(("fields",), self._load_custom_fields)
+        return self._custom_fields.get(name)
+
+    def _load_custom_fields(self):
         for field in self._jira_client.fields():
-            if field["name"] == name:
-                return field["id"]
+            self._custom_fields.setdefault(field["name"], field["id"])
 
-    def rank_issues_by_list(self, ranked_list, on_top_of_issue):
+    def rank_issues_by_list(self, ranked_list, on_top_of_issue, journal=None):
         """
         sorts the provided list by rank on top of the latter issue
 
         :param ranked_list: list of issues to be sorted by rank index 0 has highest rank
         :param on_top_of_issue: issue on top of which these issues need to land
+        :param journal: records the ranked issues, a rerun with the same journal skips the issues which are already ranked
+        :type journal: jira_agile_toolbox.journal.Journal
 
 
         ``Example``
@@ -167,19 +540,40 @@ def rank_issues_by_list(self, ranked_list, on_top_of_issue):
         =======     =======
 
         """
-        reversed_list = ranked_list[::-1]
-        reversed_list.insert(0, on_top_of_issue)
-        for i, value in enumerate(reversed_list):
-            if i < len(reversed_list) - 1:
-                self._jira_client.rank(reversed_list[i + 1].key, value.key)
+        self._rank_keys([issue.key for issue in ranked_list], on_top_of_issue.key, journal)
 
-    def rank_issues_at_top_of_project(self, ranked_list, project):
+    def _rank_keys(self, ranked_keys, on_top_of_key, journal=None):
+        reversed_keys = ranked_keys[::-1]
+        reversed_keys.insert(0, on_top_of_key)
+        # the scope holds a digest of the ranked keys in their order, so only a rerun of the same ranking resumes from the journal
+        journal_scope = f"rank:{on_top_of_key}:{hashlib.sha1(','.join(ranked_keys).encode()).hexdigest()}" if journal else None
+        try:
+            for i, value in enumerate(reversed_keys):
+                if i < len(reversed_keys) - 1:
+                    if journal and journal.is_done(journal_scope, reversed_keys[i + 1]):
+                        continue
+                    self._jira_client.rank(reversed_keys[i + 1], value)
+                    for rank_index in list(self._rank_indexes.values()):
+                        rank_index.move_before(reversed_keys[i + 1], value)
+                    if journal:
+                        journal.mark_done(journal_scope, reversed_keys[i + 1])
+        finally:
+            self._invalidate_cache(issue_keys=ranked_keys)
+            if journal:
+                journal.flush()
+
+    def rank_issues_at_top_of_project(self, ranked_list, project, journal=None):
         """
         moves the provided ranked_list at the top of the backlog of the given project
 
         :param ranked_list: a list of jira Issues
         :param project: project key
         :type project: str
+        :param journal: records the ranked issues, a rerun with the same journal skips the issues which are already ranked
+        :type journal: jira_agile_toolbox.journal.Journal
+
+        when a backlog rank index of the project was created with :meth:`get_backlog_rank_index` the top of the backlog is
+        taken from the index instead of searching jira
 
         ``Example``
 
@@ -204,13 +598,191 @@ def rank_issues_at_top_of_project(self, ranked_list, project):
         =======     =======
 
         """
+        if project in self._rank_indexes:
+            ranked_keys = [issue.key for issue in ranked_list]
+            top_key = self._rank_indexes[project].top(exclude=ranked_keys)
+            if top_key:
+                self._rank_keys(ranked_keys, top_key, journal)
+            return
         issues_sorted_on_rank = self._jira_client.search_issues(f"project = { project } ORDER BY Rank ASC", fields="key", maxResults=1000)
         for issue in issues_sorted_on_rank:
             if issue not in ranked_list:
-                self.rank_issues_by_list(ranked_list, issue)
+                self.rank_issues_by_list(ranked_list, issue, journal=journal)
+                break
+
+    def get_backlog_rank_index(self, project, refresh=False):
+        """
+        pages once through the backlog of the project and returns an index of its rank order
+
+        the index is kept by the toolbox and updated by its own rank methods, so it does not need to be downloaded again
+
+        :param project: project key
+        :type project: str
+        :param refresh: download the backlog again even if the toolbox already has an index of it
+        :type refresh: bool
+        :return: the rank index of the backlog
+        :rtype: jira_agile_toolbox.rank_index.BacklogRankIndex
+
+        ``Example``
+
+            .. code-block:: python
+
+                >>> from jira_agile_toolbox import JiraAgileToolBox
+                >>> from jira import JIRA
+                >>> my_jira_client = JIRA("https://my-jira-server.com", basic_auth=("MYUSERNAME","MYPASSWORD")
+                >>> tb = JiraAgileToolBox(my_jira_client)
+                >>> backlog = tb.get_backlog_rank_index("JAT")
+                >>> backlog.position("JAT-003")
+                2
+                >>> backlog.is_ordered(["JAT-010", "JAT-005", "JAT-003"])
+                True
+        """
+        from jira_agile_toolbox.rank_index import BacklogRankIndex
+
+        def load_rank_index():
+            rank_field = self._get_custom_field_from_name(RANK_FIELD_NAME)
+            ranked_issues = [
+                (issue["key"], issue["fields"][rank_field])
+                for page in self._iter_search_pages(f"project = { project } ORDER BY Rank ASC", fields=[rank_field])
+                for issue in page
+                if issue["fields"].get(rank_field)
+            ]
+            self._rank_indexes[project] = BacklogRankIndex(project, ranked_issues)
+
+        if refresh or project not in self._rank_indexes:
+            self._single_flight.do(("rank_index", project), load_rank_index)
+        return self._rank_indexes[project]
+
+    def _iter_search_pages(self, jql_query, fields, page_size=DEFAULT_PAGE_SIZE):
+        """
+        helper method which yields the raw json issues of a search page by page
+
+        :param jql_query: the complete jql query
+        :param fields: the fields to get
+        :param page_size: the number of issues per page
+        """
+        start_at = 0
+        while True:
+            page = self._search_issues(jql_query, startAt=start_at, maxResults=page_size, fields=fields, json_result=True)
+            issues = page.get("issues", [])
+            if issues:
+                yield issues
+            start_at += len(issues)
+            if not issues or start_at >= page.get("total", 0):
+                return
+
+    def plan_sprints(self, project, capacities, jql_query="", sprint_ids=None):
+        """
+        fills the next sprints with the backlog of a project in rank order until the story points reach their capacity
+
+        the backlog holds the issues of the project which are not done and not in an active or future sprint yet, it is read
+        once, page by page, and only as far as the total capacity reaches. Sprints are filled in order
+        and never skip an issue: a sprint is closed at the first issue which does not fit anymore and that issue is tried in
+        the next sprint. Issues without story points fill up along with the sprint being planned.
+
+        :param project: the project key
+        :type project: str
+        :param capacities: the number of story points per sprint, one value for every sprint to plan
+        :type capacities: list
+        :param jql_query: a query of the form 'component = backend' will be AND'ed after the autogenerated search
+        :type jql_query: str
+        :param sprint_ids: when given, the planned issues are moved to these sprints (one id per capacity), 50 issues per request
+        :type sprint_ids: list
+        :return: per sprint a dictionary with the planned issue keys in rank order, their story points and the capacity
+        :rtype: list
+
+        ``Example``
+
+            .. code-block:: python
+
+                >>> from jira_agile_toolbox import JiraAgileToolBox
+                >>> from jira import JIRA
+                >>> my_jira_client = JIRA("https://my-jira-server.com", basic_auth=("MYUSERNAME","MYPASSWORD")
+                >>> tb = JiraAgileToolBox(my_jira_client)
+                >>> tb.plan_sprints("JAT", [10, 10], sprint_ids=[31, 32])
+                [{'issues': ['JAT-010', 'JAT-005'], 'story_points': 8, 'capacity': 10, 'sprint_id': 31},
+                 {'issues': ['JAT-003', 'JAT-002', 'JAT-001'], 'story_points': 10, 'capacity': 10, 'sprint_id': 32}]
+        """
+        if sprint_ids is not None and len(sprint_ids) != len(capacities):
+            raise ValueError("sprint_ids should hold one sprint id per capacity")
+        story_points_field = self._get_story_points_custom_field()
+        jql_query_to_find_the_backlog = f"project = { project } AND {BACKLOG_QUERY}"
+        if jql_query:
+            jql_query_to_find_the_backlog += f" AND {jql_query}"
+        jql_query_to_find_the_backlog += " ORDER BY Rank ASC"
+
+        # prefix_sums[i] holds the story points of the first i issues of the backlog
+        keys = []
+        prefix_sums = [0]
+        total_capacity = sum(capacities)
+        for page in self._iter_search_pages(jql_query_to_find_the_backlog, fields=[story_points_field]):
+            for issue in page:
+                keys.append(issue["key"])
+                prefix_sums.append(prefix_sums[-1] + (issue["fields"].get(story_points_field) or 0))
+            if prefix_sums[-1] > total_capacity:
                 break
 
-    def add_labels_to_all_sub_items_of_epic(self, epic, labels, keep_already_present=True, jql_query=""):
+        plan = []
+        start = 0
+        for capacity in capacities:
+            end = bisect.bisect_right(prefix_sums, prefix_sums[start] + capacity) - 1
+            plan.append({"issues": keys[start:end], "story_points": prefix_sums[end] - prefix_sums[start], "capacity": capacity})
+            start = end
+
+        if sprint_ids is not None:
+            try:
+                for sprint_id, sprint in zip(sprint_ids, plan):
+                    sprint["sprint_id"] = sprint_id
+                    for first in range(0, len(sprint["issues"]), ISSUES_PER_SPRINT_MOVE):
+                        self._jira_client.add_issues_to_sprint(sprint_id, sprint["issues"][first : first + ISSUES_PER_SPRINT_MOVE])
+            finally:
+                self._invalidate_cache(issue_keys=keys[:start])
+        return plan
+
+    def export_epic(self, epic, output, format="ndjson", fields=None, jql_query="", page_size=DEFAULT_PAGE_SIZE):
+        """
+        streams all 'Issues in Epic' to a ndjson, csv or parquet file
+
+        only a few pages are held in memory at any time, the next page is fetched while the current one is written. Every
+        row holds the issue key and the exported fields, objects are reduced to their name and in csv and parquet lists are
+        joined with ";".
+
+        :param epic: and epic key as a string or the epic as a jira.Issue
+        :type epic: str jira.Issue
+        :param output: a path or an open file, text for ndjson and csv, binary for parquet
+        :type output: str file
+        :param format: "ndjson", "csv" or "parquet" (parquet needs pyarrow, see the "parquet" extra)
+        :type format: str
+        :param fields: the fields to export, the key is always exported (defaults to summary, issuetype, status, assignee, fixVersions and labels)
+        :type fields: str list
+        :param jql_query: a query of the form 'project in (PROJ001,PROJ002)' or 'issuetype not in ('Task') AND status != Closed' will be AND'ed after the autogenerated search
+        :type jql_query: str
+        :param page_size: the number of issues to fetch per request
+        :type page_size: int
+        :return: the number of exported issues
+        :rtype: int
+
+        ``Example``
+
+            .. code-block:: python
+
+                >>> from jira_agile_toolbox import JiraAgileToolBox
+                >>> tb = JiraAgileToolBox.from_server("https://my-jira-server.com", basic_auth=("MYUSERNAME","MYPASSWORD"))
+                >>> tb.export_epic("JAT-001", "jat-001.csv", format="csv", fields=["summary", "status", "customfield_10282"])
+                1250
+        """
+        from jira_agile_toolbox.export import DEFAULT_EXPORT_FIELDS, FORMATS, write_pages
+
+        if format not in FORMATS:
+            raise ValueError(f"format should be one of {', '.join(FORMATS)}")
+        fields_to_export = self._input_validation_fields(fields) or DEFAULT_EXPORT_FIELDS
+        epic_key = epic.key if _is_jira_issue(epic) else epic
+        jql_query_to_find_the_issues = f"'parentEpic' = {epic_key} AND {jql_query}" if jql_query else f"'parentEpic' = {epic_key}"
+        # a fixed order keeps the pages from overlapping when the epic changes while it is exported
+        pages = self._iter_search_pages(f"{jql_query_to_find_the_issues} ORDER BY key ASC", fields=fields_to_export, page_size=page_size)
+        return write_pages(pages, output, format, fields_to_export)
+
+    def add_labels_to_all_sub_items_of_epic(self, epic, labels, keep_already_present=True, jql_query="", journal=None):
         """
         adds labels to all 'Issues in Epic'
 
@@ -222,6 +794,8 @@ def add_labels_to_all_sub_items_of_epic(self, epic, labels, keep_already_present
         :type keep_already_present: bool
         :param jql_query: a query of the form 'project in (PROJ001,PROJ002)' or 'issuetype not in ('Task') AND status != Closed' will be AND'ed after the autogenerated search
         :type jql_query: str
+        :param journal: records the updated issues, a rerun with the same journal skips the issues which are already updated
+        :type journal: jira_agile_toolbox.journal.Journal
 
         ``Example``
 
@@ -236,13 +810,72 @@ def add_labels_to_all_sub_items_of_epic(self, epic, labels, keep_already_present
             this will append the "label_to_set" to all existing labels of all Issues in Epic
         """
         labels_to_set = self._input_validation_labels(labels)
+        epic_key = epic.key if _is_jira_issue(epic) else epic
         items_to_update = self.get_all_issues_in_epic(epic, fields=["labels"], jql_query=jql_query)
-        for item in items_to_update:
-            if keep_already_present:
-                for label in labels_to_set:
-                    item.add_field_value("labels", label)
-            else:
-                item.update(fields={"labels": labels_to_set})
+        journal_scope = f"labels:{epic_key}:{','.join(labels_to_set)}" if journal else None
+        try:
+            for item in items_to_update:
+                if journal and journal.is_done(journal_scope, item.key):
+                    continue
+                if keep_already_present:
+                    for label in labels_to_set:
+                        item.add_field_value("labels", label)
+                else:
+                    item.update(fields={"labels": labels_to_set})
+                if journal:
+                    journal.mark_done(journal_scope, item.key)
+        finally:
+            self._invalidate_cache(epic_keys=[epic_key])
+            if journal:
+                journal.flush()
+
+    def add_labels_to_all_sub_items_of_epics(self, epics, labels, keep_already_present=True, jql_query="", journal=None):
+        """
+        adds labels to all 'Issues in Epic' of several epics
+
+        all issues are found with as few searches as possible (see :meth:`get_all_issues_in_epics`) and every issue is
+        updated once, also when it is found under more than one epic
+
+        :param epics: a list of epic keys as strings or epics as jira.Issue
+        :type epics: list
+        :param labels: the label to set as a string or the labels to set as a list
+        :type labels: str list
+        :param keep_already_present: if this is set to False already present labels will be overwritten (defaults to True)
+        :type keep_already_present: bool
+        :param jql_query: a query of the form 'project in (PROJ001,PROJ002)' or 'issuetype not in ('Task') AND status != Closed' will be AND'ed after the autogenerated search
+        :type jql_query: str
+        :param journal: records the updated issues, a rerun with the same journal skips the issues which are already updated
+        :type journal: jira_agile_toolbox.journal.Journal
+
+        ``Example``
+
+            .. code-block:: python
+
+                >>> from jira_agile_toolbox import JiraAgileToolBox
+                >>> from jira import JIRA
+                >>> my_jira_client = JIRA("https://my-jira-server.com", basic_auth=("MYUSERNAME","MYPASSWORD")
+                >>> tb = JiraAgileToolBox(my_jira_client)
+                >>> tb.add_labels_to_all_sub_items_of_epics(["PROJ001-001", "PROJ001-010"], ["release_train_1"])
+
+            this will append the "release_train_1" to all existing labels of all Issues in both Epics
+        """
+        labels_to_set = self._input_validation_labels(labels)
+        items_to_update = self.get_all_issues_in_epics(epics, fields=["labels"], jql_query=jql_query)
+        journal_scope = f"labels:{','.join(labels_to_set)}" if journal else None
+        try:
+            for item in items_to_update:
+                if journal and journal.is_done(journal_scope, item.key):
+                    continue
+                if keep_already_present:
+                    item.update(update={"labels": [{"add": label} for label in labels_to_set]})
+                else:
+                    item.update(fields={"labels": labels_to_set})
+                if journal:
+                    journal.mark_done(journal_scope, item.key)
+        finally:
+            self._invalidate_cache(epic_keys=[epic.key if _is_jira_issue(epic) else epic for epic in epics])
+            if journal:
+                journal.flush()
 
     def _input_validation_labels(self, labels):
         labels_to_set = []
@@ -262,7 +895,7 @@ def _input_validation_labels(self, labels):
             raise ValueError(bad_input)
         return labels_to_set
 
-    def copy_fix_version_from_epic_to_all_items_in_epic(self, epic, keep_already_present=True, jql_query=""):
+    def copy_fix_version_from_epic_to_all_items_in_epic(self, epic, keep_already_present=True, jql_query="", journal=None):
         """
         copies fixVersions from the epic to all 'Issues in Epic'
         also applies to different projects as long as the version name is the same it works
@@ -273,6 +906,8 @@ def copy_fix_version_from_epic_to_all_items_in_epic(self, epic, keep_already_pre
         :type keep_already_present: bool
         :param jql_query: a query of the form 'project in (PROJ001,PROJ002)' or 'issuetype not in ('Task') AND status != Closed' will be AND'ed after the autogenerated search
         :type jql_query: str
+        :param journal: records the updated issues, a rerun with the same journal skips the issues which are already updated
+        :type journal: jira_agile_toolbox.journal.Journal
 
         ``Example``
 
@@ -289,11 +924,133 @@ def copy_fix_version_from_epic_to_all_items_in_epic(self, epic, keep_already_pre
                 >>> tb.get_all_issues_in_epic("JAT-001")[0].fields.fixVersions
                 [<JIRA Version: name='0.0.10', id='31063'>]
         """
-        jira_epic = epic if isinstance(epic, jira.Issue) else self._jira_client.issue(epic)
+        jira_epic = epic if _is_jira_issue(epic) else self._jira_client.issue(epic, fields="fixVersions")
         versions = [{"name": version.name} for version in jira_epic.fields.fixVersions]
-        for issue in self.get_all_issues_in_epic(jira_epic, fields=["fixVersions"], jql_query=jql_query):
-            if keep_already_present:
-                for version in versions:
-                    issue.add_field_value("fixVersions", {"name": version["name"]})
-            else:
-                issue.update(fields={"fixVersions": versions})
+        mode = "add" if keep_already_present else "replace"
+        journal_scope = f"fixVersions:{jira_epic.key}:{','.join(version['name'] for version in versions)}:{mode}" if journal else None
+        try:
+            for issue in self.get_all_issues_in_epic(jira_epic, fields=["fixVersions"], jql_query=jql_query):
+                if journal and journal.is_done(journal_scope, issue.key):
+                    continue
+                if keep_already_present:
+                    for version in versions:
+                        issue.add_field_value("fixVersions", {"name": version["name"]})
+                else:
+                    issue.update(fields={"fixVersions": versions})
+                if journal:
+                    journal.mark_done(journal_scope, issue.key)
+        finally:
+            self._invalidate_cache(epic_keys=[jira_epic.key])
+            if journal:
+                journal.flush()
+
+    def copy_fix_version_from_epics_to_all_items_in_epics(self, epics, keep_already_present=True, jql_query="", journal=None):
+        """
+        copies the fixVersions of several epics to all their 'Issues in Epic'
+        also applies to different projects as long as the version name is the same it works
+
+        the fixVersions of all epics are fetched with one search, the children of all epics sharing the same fixVersions
+        are fetched together (see :meth:`get_all_issues_in_epics`). Version names are resolved to ids once per project
+        and every issue gets a single id based update.
+
+        :param epics: a list of epic keys as strings or epics as jira.Issue
+        :type epics: list
+        :param keep_already_present: if this is set to False already present fixVersions will be overwritten (defaults to True)
+        :type keep_already_present: bool
+        :param jql_query: a query of the form 'project in (PROJ001,PROJ002)' or 'issuetype not in ('Task') AND status != Closed' will be AND'ed after the autogenerated search
+        :type jql_query: str
+        :param journal: records the updated issues, a rerun with the same journal skips the issues which are already updated
+        :type journal: jira_agile_toolbox.journal.Journal
+
+        ``Example``
+
+            .. code-block:: python
+
+                >>> from jira_agile_toolbox import JiraAgileToolBox
+                >>> from jira import JIRA
+                >>> my_jira_client = JIRA("https://my-jira-server.com", basic_auth=("MYUSERNAME","MYPASSWORD")
+                >>> tb = JiraAgileToolBox(my_jira_client)
+                >>> tb.copy_fix_version_from_epics_to_all_items_in_epics(["PROJ001-001", "PROJ001-010"])
+        """
+        epics_by_version_names = {}
+        for jira_epic in self._get_epics_with_fix_versions(epics):
+            version_names = tuple(version.name for version in jira_epic.fields.fixVersions)
+            epics_by_version_names.setdefault(version_names, []).append(jira_epic)
+
+        try:
+            # an issue under several epics gets the fixVersions of all of them, in one update
+            issues_to_update = {}
+            for version_names, epics_with_these_versions in epics_by_version_names.items():
+                if keep_already_present and not version_names:
+                    continue
+                for issue in self.get_all_issues_in_epics(
+                    epics_with_these_versions, fields=["fixVersions", "project"], jql_query=jql_query
+                ):
+                    _, version_names_of_issue = issues_to_update.setdefault(issue.key, (issue, {}))
+                    version_names_of_issue.update(dict.fromkeys(version_names))
+
+            for issue, version_names_of_issue in issues_to_update.values():
+                version_names = tuple(version_names_of_issue)
+                journal_scope = f"fixVersions:{','.join(version_names)}" if journal else None
+                if journal and journal.is_done(journal_scope, issue.key):
+                    continue
+                versions = self._get_version_references(issue.fields.project.key, version_names)
+                if keep_already_present:
+                    issue.update(update={"fixVersions": [{"add": version} for version in versions]})
+                else:
+                    issue.update(fields={"fixVersions": versions})
+                if journal:
+                    journal.mark_done(journal_scope, issue.key)
+        finally:
+            self._invalidate_cache(epic_keys=[epic.key if _is_jira_issue(epic) else epic for epic in epics])
+            if journal:
+                journal.flush()
+
+    def _invalidate_cache(self, epic_keys=(), issue_keys=()):
+        """
+        helper method which drops the cached searches of the epics and the cached searches which found the issues
+
+        :param epic_keys: the keys of the epics whose issues changed
+        :param issue_keys: the keys of the issues which changed
+        """
+        if self._cache is None:
+            return
+        for epic_key in epic_keys:
+            self._cache.invalidate_epic(epic_key)
+        for issue_key in issue_keys:
+            self._cache.invalidate_issue(issue_key)
+
+    def _get_epics_with_fix_versions(self, epics):
+        """
+        helper method to get the fixVersions of the epics, the keys among them are searched for 50 at once
+
+        :param epics: a list of epic keys as strings or epics as jira.Issue
+        :raises ValueError: when not all epics are found
+        """
+        jira_epics = [epic for epic in epics if _is_jira_issue(epic)]
+        epic_keys = list(dict.fromkeys(epic for epic in epics if not _is_jira_issue(epic)))
+        found = {}
+        for start in range(0, len(epic_keys), EPICS_PER_SEARCH):
+            for jira_epic in self._jira_client.search_issues(
+                f"key in ({','.join(epic_keys[start : start + EPICS_PER_SEARCH])})", fields=["fixVersions"], maxResults=0
+            ):
+                found[jira_epic.key] = jira_epic
+        missing = [key for key in epic_keys if key not in found]
+        if missing:
+            raise ValueError(f"issues not found: {', '.join(missing)}")
+        return jira_epics + [found[key] for key in epic_keys]
+
+    def _get_version_references(self, project, version_names):
+        """
+        helper method to refer to versions by id, names which are unknown in the project are passed on by name
+
+        :param project: the project key of the issue which gets the versions
+        :param version_names: the names of the versions
+        """
+        if project not in self._project_versions:
+            self._single_flight.do(("versions", project), self._load_project_versions, project)
+        version_ids = self._project_versions[project]
+        return [{"id": version_ids[name]} if name in version_ids else {"name": name} for name in version_names]
+
+    def _load_project_versions(self, project):
+        self._project_versions[project] = {version.name: version.id for version in self._jira_client.project_versions(project)}
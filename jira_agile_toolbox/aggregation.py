@@ -0,0 +1,94 @@
+"""
+one pass aggregation of issues over several dimensions, used by :meth:`JiraAgileToolBox.get_aggregations_from_epic`
+
+a dimension reads one or more values from an issue, issues with several values (e.g. components) count for each of them
+and issues without a value count under None
+"""
+
+import itertools
+import re
+
+SPRINT_FIELD_NAME = "Sprint"
+_SPRINT_NAME_IN_STRING = re.compile(r"name=([^,\]]*)")
+
+
+def _names(value):
+    return [getattr(value, "name", None)] if value else [None]
+
+
+def _assignee(value):
+    return [getattr(value, "displayName", None)] if value else [None]
+
+
+def _components(value):
+    return [component.name for component in value] if value else [None]
+
+
+def _sprints(value):
+    # depending on the jira version sprints are objects with a name or strings like "...Sprint@1a2b[id=1,name=Sprint 1,...]"
+    sprint_names = []
+    for sprint in value or []:
+        if isinstance(sprint, str):
+            match = _SPRINT_NAME_IN_STRING.search(sprint)
+            sprint_names.append(match.group(1) if match else sprint)
+        else:
+            sprint_names.append(getattr(sprint, "name", None))
+    return sprint_names or [None]
+
+
+# dimension name: (field name or None for the custom "Sprint" field, function returning the values of the field)
+DIMENSIONS = {
+    "status": ("status", _names),
+    "assignee": ("assignee", _assignee),
+    "issuetype": ("issuetype", _names),
+    "component": ("components", _components),
+    "sprint": (None, _sprints),
+}
+
+
+def input_validation_group_by(group_by):
+    cubes = []
+    for cube in [group_by] if isinstance(group_by, str) else group_by:
+        cube = (cube,) if isinstance(cube, str) else tuple(cube)
+        unknown = [dimension for dimension in cube if dimension not in DIMENSIONS]
+        if not cube or unknown:
+            raise ValueError(f"group_by should contain dimensions out of {', '.join(DIMENSIONS)}")
+        cubes.append(cube)
+    # a grouping asked for twice is aggregated once, otherwise its groups would count every issue twice
+    return list(dict.fromkeys(cubes))
+
+
+def _cube_key(cube):
+    return cube[0] if len(cube) == 1 else cube
+
+
+def aggregate(issues, cubes, dimension_fields, metric_fields):
+    """
+    counts the issues and sums the metrics per group for every cube in a single pass over the issues
+
+    :param issues: the issues to aggregate
+    :param cubes: a list of tuples of dimension names
+    :param dimension_fields: maps every dimension in the cubes to the field to read it from
+    :param metric_fields: maps a metric name to the field holding its number
+    :return: per cube (keyed by the dimension name or the tuple of dimension names) a dict mapping the group (a value or a
+        tuple of values for more dimensions) to its count and metrics, and a "total" over all issues
+    """
+    dimensions = list(dict.fromkeys(dimension for cube in cubes for dimension in cube))
+    empty_group = dict.fromkeys(["count", *metric_fields], 0)
+    result = {_cube_key(cube): {} for cube in cubes}
+    total = dict(empty_group)
+    for issue in issues:
+        if not issue:
+            continue
+        values = {dimension: DIMENSIONS[dimension][1](getattr(issue.fields, dimension_fields[dimension], None)) for dimension in dimensions}
+        measures = {metric: getattr(issue.fields, field, None) or 0 for metric, field in metric_fields.items()}
+        measures["count"] = 1
+        for metric, measure in measures.items():
+            total[metric] += measure
+        for cube in cubes:
+            for group in itertools.product(*(values[dimension] for dimension in cube)):
+                group_totals = result[_cube_key(cube)].setdefault(group if len(cube) > 1 else group[0], dict(empty_group))
+                for metric, measure in measures.items():
+                    group_totals[metric] += measure
+    result["total"] = total
+    return result
@@ -0,0 +1,225 @@
+"""
+an in-process cache of the issues found by :meth:`JiraAgileToolBox.get_all_issues_in_epic`
+
+pass an :class:`EpicCache` to the toolbox to reuse search results, keep it up to date with the webhook receiver in
+:mod:`jira_agile_toolbox.webhook`, let entries expire after a while or invalidate it yourself. The write methods of the
+toolbox invalidate the epics they change.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_MAX_ISSUES = 100_000
+
+
+class EpicCache:
+    """
+    caches the issues of epic searches per (epic, fields, jql_query) and remembers which issues each search returned
+
+    when the cache is full the least recently used searches are dropped. Its memory is bounded by the number of issues it
+    holds, a search which finds more issues than that on its own is not cached.
+
+    :param ttl: the number of seconds a search stays valid, None keeps it until it is invalidated or dropped (defaults to None)
+    :type ttl: float
+    :param max_entries: the number of searches to keep (defaults to 1000)
+    :type max_entries: int
+    :param max_issues: the number of issues to keep over all searches (defaults to 100000)
+    :type max_issues: int
+
+    ``Example``
+
+        .. code-block:: python
+
+            >>> from jira_agile_toolbox import JiraAgileToolBox
+            >>> from jira_agile_toolbox.cache import EpicCache
+            >>> cache = EpicCache(ttl=30)
+            >>> tb = JiraAgileToolBox(my_jira_client, cache=cache)
+            >>> tb.get_storypoints_from_epic("JAT-001")  # searches jira
+            {'total': 100, "Reported": 50, "Closed": 50}
+            >>> tb.get_storypoints_from_epic("JAT-001")  # served from the cache
+            {'total': 100, "Reported": 50, "Closed": 50}
+            >>> cache.invalidate_epic("JAT-001")
+    """
+
+    def __init__(self, ttl=None, max_entries=DEFAULT_MAX_ENTRIES, max_issues=DEFAULT_MAX_ISSUES):
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._max_issues = max_issues
+        self._lock = threading.RLock()
+        # cache key -> (issues, expiry time), the least recently used search comes first
+        self._entries = OrderedDict()
+        self._keys_per_issue = {}
+        self._number_of_issues = 0
+        # every invalidation gets the next generation, while searches run the generation of the last invalidation of each
+        # epic and issue is kept so a search which started before it does not store its outdated result
+        self._generation = 0
+        self._searches_in_flight = 0
+        self._epic_invalidated_at = {}
+        self._issue_invalidated_at = {}
+        self._cleared_at = 0
+
+    @staticmethod
+    def key(epic_key, fields, jql_query):
+        return epic_key, tuple(fields or ()), jql_query or ""
+
+    def get(self, epic_key, fields, jql_query):
+        """
+        returns a copy of the cached issues or None when the search is not cached
+
+        :param epic_key: the epic key
+        :type epic_key: str
+        :param fields: the fields of the search
+        :type fields: list
+        :param jql_query: the extra query of the search
+        :type jql_query: str
+        """
+        key = self.key(epic_key, fields, jql_query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            issues, expires_at = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                self._remove_entry(key)
+                return None
+            self._entries.move_to_end(key)
+            return list(issues)
+
+    def start_search(self):
+        """
+        returns the generation to pass to :meth:`put` for a search which is about to start, end it with :meth:`end_search`
+
+        ``Example``
+
+            .. code-block:: python
+
+                >>> generation = cache.start_search()
+                >>> try:
+                ...     issues = my_jira_client.search_issues("'parentEpic' = JAT-001")
+                ...     cache.put("JAT-001", None, "", issues, generation=generation)
+                ... finally:
+                ...     cache.end_search()
+        """
+        with self._lock:
+            self._searches_in_flight += 1
+            return self._generation
+
+    def end_search(self):
+        """marks a search started with :meth:`start_search` as finished, also when it failed"""
+        with self._lock:
+            self._searches_in_flight -= 1
+            if not self._searches_in_flight:
+                self._epic_invalidated_at.clear()
+                self._issue_invalidated_at.clear()
+
+    def put(self, epic_key, fields, jql_query, issues, generation=None):
+        """
+        stores the issues found by a search, unless the epic or one of the issues was invalidated while the search ran
+
+        :param epic_key: the epic key
+        :type epic_key: str
+        :param fields: the fields of the search
+        :type fields: list
+        :param jql_query: the extra query of the search
+        :type jql_query: str
+        :param issues: the issues found
+        :type issues: list
+        :param generation: the generation :meth:`start_search` returned before the search started
+        :type generation: int
+        """
+        key = self.key(epic_key, fields, jql_query)
+        issues = list(issues)
+        with self._lock:
+            if generation is not None and self._invalidated_since(generation, epic_key, issues):
+                return
+            self._remove_entry(key)
+            if len(issues) > self._max_issues:
+                return
+            expires_at = time.monotonic() + self._ttl if self._ttl is not None else None
+            self._entries[key] = (issues, expires_at)
+            self._number_of_issues += len(issues)
+            for issue in issues:
+                self._keys_per_issue.setdefault(getattr(issue, "key", None), set()).add(key)
+            while len(self._entries) > self._max_entries or self._number_of_issues > self._max_issues:
+                self._remove_entry(next(iter(self._entries)))
+
+    def _invalidated_since(self, generation, epic_key, issues):
+        if self._cleared_at > generation or self._epic_invalidated_at.get(epic_key, 0) > generation:
+            return True
+        return any(self._issue_invalidated_at.get(getattr(issue, "key", None), 0) > generation for issue in issues)
+
+    def _next_generation(self):
+        self._generation += 1
+        return self._generation
+
+    def epics(self):
+        """returns the keys of all epics with cached searches"""
+        with self._lock:
+            return {epic_key for epic_key, _, _ in self._entries}
+
+    def invalidate_epic(self, epic_key):
+        """
+        forgets all cached searches of the epic
+
+        :param epic_key: the epic key
+        :type epic_key: str
+        """
+        with self._lock:
+            if self._searches_in_flight:
+                self._epic_invalidated_at[epic_key] = self._next_generation()
+            for key in [key for key in self._entries if key[0] == epic_key]:
+                self._remove_entry(key)
+
+    def invalidate_issue(self, issue_key):
+        """
+        forgets all cached searches which found the issue
+
+        :param issue_key: the issue key
+        :type issue_key: str
+        """
+        with self._lock:
+            if self._searches_in_flight:
+                self._issue_invalidated_at[issue_key] = self._next_generation()
+            for key in list(self._keys_per_issue.get(issue_key, ())):
+                self._remove_entry(key)
+
+    def remove_issue(self, issue_key):
+        """
+        removes the issue from all cached searches which found it, e.g. because it was deleted
+
+        :param issue_key: the issue key
+        :type issue_key: str
+        """
+        with self._lock:
+            if self._searches_in_flight:
+                self._issue_invalidated_at[issue_key] = self._next_generation()
+            for key in self._keys_per_issue.pop(issue_key, ()):
+                issues, expires_at = self._entries[key]
+                remaining_issues = [issue for issue in issues if getattr(issue, "key", None) != issue_key]
+                self._number_of_issues -= len(issues) - len(remaining_issues)
+                self._entries[key] = (remaining_issues, expires_at)
+
+    def clear(self):
+        """forgets everything"""
+        with self._lock:
+            self._cleared_at = self._next_generation()
+            self._entries.clear()
+            self._keys_per_issue.clear()
+            self._number_of_issues = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _remove_entry(self, key):
+        issues, _ = self._entries.pop(key, ((), None))
+        self._number_of_issues -= len(issues)
+        for issue in issues:
+            issue_key = getattr(issue, "key", None)
+            keys = self._keys_per_issue.get(issue_key)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_per_issue[issue_key]
@@ -0,0 +1,174 @@
+"""
+the ``jat`` command line
+
+only the standard library is imported at module level, jira and requests are imported once a subcommand needs a client so
+``jat --help`` and argument errors return without paying for those imports.
+
+``Example``
+
+    .. code-block:: bash
+
+        $ export JIRA_SERVER=https://my-jira-server.com JIRA_USER=MYUSERNAME JIRA_TOKEN=MYTOKEN
+        $ jat storypoints JAT-001
+        {"total": 100, "Reported": 50, "Closed": 50}
+        $ jat label JAT-001 label_to_set other_label
+        $ jat fix-version JAT-001 --replace
+        $ jat rank JAT-001 JAT-003 --on-top-of JAT-005
+        $ jat rank JAT-001 JAT-003 --top-of-project JAT
+        $ jat run nightly.yaml
+        $ jat export JAT-001 --format csv --output jat-001.csv --fields summary,status,customfield_10282
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from jira_agile_toolbox import DEFAULT_MAX_WORKERS
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="jat", description="agile tooling for jira")
+    parser.add_argument("--server", default=os.environ.get("JIRA_SERVER"), help="url of the jira server (env: JIRA_SERVER)")
+    parser.add_argument("--user", default=os.environ.get("JIRA_USER"), help="user name for basic auth (env: JIRA_USER)")
+    parser.add_argument(
+        "--token",
+        default=os.environ.get("JIRA_TOKEN"),
+        help="api token, used as password together with --user or as personal access token without it (env: JIRA_TOKEN)",
+    )
+    parser.add_argument("--max-workers", type=int, default=DEFAULT_MAX_WORKERS, help="number of concurrent calls to jira")
+    parser.add_argument("--version", action="store_true", help="show the version and exit")
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+
+    storypoints = subparsers.add_parser("storypoints", help="print the story points per status of an epic as json")
+    storypoints.add_argument("epic", help="epic key")
+    storypoints.add_argument("--jql", default="", help="extra jql query AND'ed to the search")
+    storypoints.set_defaults(handler=_storypoints)
+
+    rank = subparsers.add_parser("rank", help="rank issues in the given order")
+    rank.add_argument("issues", nargs="+", help="issue keys, the first one gets the highest rank")
+    rank_target = rank.add_mutually_exclusive_group(required=True)
+    rank_target.add_argument("--on-top-of", help="issue key on top of which the issues need to land")
+    rank_target.add_argument("--top-of-project", help="project key on top of whose backlog the issues need to land")
+    rank.add_argument("--journal", help="journal file, a rerun with the same journal skips the issues which are already done")
+    rank.set_defaults(handler=_rank)
+
+    label = subparsers.add_parser("label", help="add labels to all issues in an epic")
+    label.add_argument("epic", help="epic key")
+    label.add_argument("labels", nargs="+", help="labels to add")
+    label.add_argument("--replace", action="store_true", help="overwrite the labels already present")
+    label.add_argument("--jql", default="", help="extra jql query AND'ed to the search")
+    label.add_argument("--journal", help="journal file, a rerun with the same journal skips the issues which are already done")
+    label.set_defaults(handler=_label)
+
+    fix_version = subparsers.add_parser("fix-version", help="copy the fixVersions of an epic to all issues in it")
+    fix_version.add_argument("epic", help="epic key")
+    fix_version.add_argument("--replace", action="store_true", help="overwrite the fixVersions already present")
+    fix_version.add_argument("--jql", default="", help="extra jql query AND'ed to the search")
+    fix_version.add_argument("--journal", help="journal file, a rerun with the same journal skips the issues which are already done")
+    fix_version.set_defaults(handler=_fix_version)
+
+    export = subparsers.add_parser("export", help="stream all issues in an epic to ndjson, csv or parquet")
+    export.add_argument("epic", help="epic key")
+    export.add_argument("--format", choices=("ndjson", "csv", "parquet"), default="ndjson", help="output format (default: ndjson)")
+    export.add_argument("--output", help="output file (default: stdout, not possible for parquet)")
+    export.add_argument("--fields", help="comma separated fields to export, the key is always exported")
+    export.add_argument("--jql", default="", help="extra jql query AND'ed to the search")
+    export.set_defaults(handler=_export)
+
+    run = subparsers.add_parser("run", help="run all jobs of a json or yaml job file with one client")
+    run.add_argument("job_file", help="path to the job file, see jira_agile_toolbox.jobs for the format")
+    run.add_argument("--journal", help="journal file, a rerun with the same journal skips the issues which are already done")
+    run.set_defaults(handler=_run)
+
+    return parser
+
+
+def make_toolbox(args):
+    """creates the toolbox for the parsed command line arguments, this is where jira gets imported"""
+    from jira_agile_toolbox import JiraAgileToolBox
+
+    jira_kwargs = {}
+    if args.user and args.token:
+        jira_kwargs["basic_auth"] = (args.user, args.token)
+    elif args.token:
+        jira_kwargs["token_auth"] = args.token
+    return JiraAgileToolBox.from_server(args.server, max_workers=args.max_workers, **jira_kwargs)
+
+
+def _storypoints(toolbox, args):
+    print(json.dumps(toolbox.get_storypoints_from_epic(args.epic, jql_query=args.jql)))
+
+
+def _journal(args):
+    if not args.journal:
+        return None
+    from jira_agile_toolbox.journal import Journal
+
+    return Journal(args.journal)
+
+
+def _rank(toolbox, args):
+    ranked_list = toolbox._get_issues_by_keys(args.issues)
+    if args.on_top_of:
+        toolbox.rank_issues_by_list(ranked_list, toolbox._jira_client.issue(args.on_top_of, fields="key"), journal=_journal(args))
+    else:
+        toolbox.rank_issues_at_top_of_project(ranked_list, args.top_of_project, journal=_journal(args))
+
+
+def _label(toolbox, args):
+    toolbox.add_labels_to_all_sub_items_of_epic(
+        args.epic, args.labels, keep_already_present=not args.replace, jql_query=args.jql, journal=_journal(args)
+    )
+
+
+def _fix_version(toolbox, args):
+    toolbox.copy_fix_version_from_epic_to_all_items_in_epic(
+        args.epic, keep_already_present=not args.replace, jql_query=args.jql, journal=_journal(args)
+    )
+
+
+def _export(toolbox, args):
+    fields = args.fields.split(",") if args.fields else None
+    if args.output:
+        toolbox.export_epic(args.epic, args.output, format=args.format, fields=fields, jql_query=args.jql)
+    elif args.format == "parquet":
+        raise ValueError("parquet can only be written to a file, pass --output")
+    else:
+        toolbox.export_epic(args.epic, sys.stdout, format=args.format, fields=fields, jql_query=args.jql)
+
+
+def _run(toolbox, args):
+    from jira_agile_toolbox.jobs import load_jobs, run_jobs
+
+    results = run_jobs(toolbox, load_jobs(args.job_file), journal=_journal(args))
+    print(json.dumps(results, default=str))
+    failed = [str(result["id"]) for result in results if result["status"] != "done"]
+    if failed:
+        raise ValueError(f"jobs not done: {', '.join(failed)}")
+
+
+def main(argv=None):
+    """entry point of the ``jat`` command, returns the exit code"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.version:
+        import jira_agile_toolbox
+
+        print(jira_agile_toolbox.__version__)
+        return 0
+    if not args.command:
+        parser.print_help()
+        return 2
+    if not args.server:
+        parser.error("the jira server is required, pass --server or set JIRA_SERVER")
+    try:
+        args.handler(make_toolbox(args), args)
+    except ValueError as error:
+        print(f"jat: error: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
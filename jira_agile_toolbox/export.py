@@ -0,0 +1,162 @@
+"""
+streams search results to a file page by page, see :meth:`JiraAgileToolBox.export_epic`
+
+only a few pages are held in memory at any time: a background thread fetches the next page while the current one is
+written, so memory use does not depend on the size of the epic.
+
+every row holds the issue key and the exported fields. Objects are reduced to their name (or display name, value or key)
+and lists to lists of those, in csv and parquet lists are joined with ";" and all values are written as text.
+"""
+
+import csv
+import json
+import queue
+import threading
+
+DEFAULT_EXPORT_FIELDS = ["summary", "issuetype", "status", "assignee", "fixVersions", "labels"]
+FORMATS = ("ndjson", "csv", "parquet")
+_PAGES_IN_FLIGHT = 2
+_END_OF_PAGES = object()
+
+
+def _flatten(value):
+    if isinstance(value, dict):
+        for name in ("name", "displayName", "value", "key"):
+            if name in value:
+                return value[name]
+        return json.dumps(value, sort_keys=True)
+    if isinstance(value, list):
+        return [_flatten(item) for item in value]
+    return value
+
+
+def _as_text(value):
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return ";".join(str(item) for item in value)
+    return str(value)
+
+
+def _rows(page, fields):
+    for issue in page:
+        issue_fields = issue.get("fields") or {}
+        row = {"key": issue["key"]}
+        for field in fields:
+            row[field] = _flatten(issue_fields.get(field))
+        yield row
+
+
+class _NdjsonWriter:
+    def __init__(self, output, fields):
+        self._output = output
+
+    def write_page(self, rows):
+        self._output.writelines(json.dumps(row) + "\n" for row in rows)
+
+    def close(self):
+        pass
+
+
+class _CsvWriter:
+    def __init__(self, output, fields):
+        self._writer = csv.DictWriter(output, fieldnames=["key", *fields])
+        self._writer.writeheader()
+
+    def write_page(self, rows):
+        self._writer.writerows({name: _as_text(value) for name, value in row.items()} for row in rows)
+
+    def close(self):
+        pass
+
+
+class _ParquetWriter:
+    def __init__(self, output, fields):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("exporting to parquet requires pyarrow, install it with 'pip install jira-agile-toolbox[parquet]'")
+        self._pyarrow = pyarrow
+        self._schema = pyarrow.schema([(name, pyarrow.string()) for name in ["key", *fields]])
+        self._writer = pyarrow.parquet.ParquetWriter(output, self._schema)
+
+    def write_page(self, rows):
+        columns = {name: [] for name in self._schema.names}
+        for row in rows:
+            for name in self._schema.names:
+                columns[name].append(_as_text(row[name]))
+        self._writer.write_table(self._pyarrow.table(columns, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+_WRITERS = {"ndjson": _NdjsonWriter, "csv": _CsvWriter, "parquet": _ParquetWriter}
+
+
+def _prefetch(pages):
+    """iterates over pages while a background thread already fetches the following ones"""
+    fetched = queue.Queue(maxsize=_PAGES_IN_FLIGHT)
+    stop = threading.Event()
+
+    def fetch():
+        try:
+            for page in pages:
+                if stop.is_set():
+                    return
+                fetched.put(page)
+            fetched.put(_END_OF_PAGES)
+        except BaseException as error:
+            fetched.put(error)
+
+    fetcher = threading.Thread(target=fetch, daemon=True)
+    fetcher.start()
+    try:
+        while True:
+            page = fetched.get()
+            if page is _END_OF_PAGES:
+                return
+            if isinstance(page, BaseException):
+                raise page
+            yield page
+    finally:
+        stop.set()
+        while fetcher.is_alive():
+            try:
+                fetched.get_nowait()
+            except queue.Empty:
+                fetcher.join(0.01)
+
+
+def write_pages(pages, output, format, fields):
+    """
+    writes search pages of raw json issues to a ndjson, csv or parquet file, the next page is fetched while one is written
+
+    :param pages: an iterable of lists of raw json issues e.g. the pages of a search
+    :param output: a path or an open file, text for ndjson and csv, binary for parquet
+    :param format: "ndjson", "csv" or "parquet" (parquet needs pyarrow)
+    :param fields: the fields to write after the key
+    :return: the number of written issues
+    """
+    if format not in FORMATS:
+        raise ValueError(f"format should be one of {', '.join(FORMATS)}")
+    opened_here = isinstance(output, str)
+    if opened_here:
+        output = open(output, "wb") if format == "parquet" else open(output, "w", encoding="utf-8", newline="")
+    written = 0
+    try:
+        writer = _WRITERS[format](output, fields)
+        try:
+            for page in _prefetch(pages):
+                rows = list(_rows(page, fields))
+                writer.write_page(rows)
+                written += len(rows)
+        finally:
+            writer.close()
+    finally:
+        if opened_here:
+            output.close()
+        else:
+            output.flush()
+    return written
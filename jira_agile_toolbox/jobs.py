@@ -0,0 +1,202 @@
+"""
+runs many toolbox operations listed in a job file in one process
+
+all jobs share one toolbox and therefore one jira client, its connection pool and the custom field cache. Jobs which do not
+depend on each other run concurrently on ``max_workers`` threads.
+
+a job file is json or yaml (yaml needs PyYAML) and looks like
+
+.. code-block:: yaml
+
+    jobs:
+      - id: points
+        op: storypoints
+        epic: JAT-001
+      - op: add_labels
+        epic: JAT-001
+        labels: [release_train_1]
+      - op: copy_fix_version
+        epic: JAT-002
+        keep_already_present: false
+      - op: rank_at_top
+        project: JAT
+        issues: [JAT-010, JAT-011]
+      - op: rank
+        issues: [JAT-012, JAT-013]
+        on_top_of: JAT-005
+        after: [points]
+
+jobs on the same epic (or any two rank jobs) run in the order of the file, ``after`` adds explicit dependencies on job ids.
+"""
+
+import json
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+def _storypoints(toolbox, job, journal):
+    return toolbox.get_storypoints_from_epic(job["epic"], jql_query=job.get("jql_query", ""))
+
+
+def _add_labels(toolbox, job, journal):
+    toolbox.add_labels_to_all_sub_items_of_epic(
+        job["epic"],
+        job["labels"],
+        keep_already_present=job.get("keep_already_present", True),
+        jql_query=job.get("jql_query", ""),
+        journal=journal,
+    )
+
+
+def _copy_fix_version(toolbox, job, journal):
+    toolbox.copy_fix_version_from_epic_to_all_items_in_epic(
+        job["epic"], keep_already_present=job.get("keep_already_present", True), jql_query=job.get("jql_query", ""), journal=journal
+    )
+
+
+def _rank(toolbox, job, journal):
+    on_top_of_issue = toolbox._jira_client.issue(job["on_top_of"], fields="key")
+    toolbox.rank_issues_by_list(toolbox._get_issues_by_keys(job["issues"]), on_top_of_issue, journal=journal)
+
+
+def _rank_at_top(toolbox, job, journal):
+    toolbox.rank_issues_at_top_of_project(toolbox._get_issues_by_keys(job["issues"]), job["project"], journal=journal)
+
+
+OPERATIONS = {
+    "storypoints": (_storypoints, ("epic",)),
+    "add_labels": (_add_labels, ("epic", "labels")),
+    "copy_fix_version": (_copy_fix_version, ("epic",)),
+    "rank": (_rank, ("issues", "on_top_of")),
+    "rank_at_top": (_rank_at_top, ("issues", "project")),
+}
+
+
+def load_jobs(path):
+    """
+    reads the jobs from a json or yaml job file
+
+    :param path: path to a .json, .yaml or .yml file
+    :type path: str
+    :return: the list of jobs
+    :rtype: list
+    """
+    with open(path, encoding="utf-8") as job_file:
+        if str(path).endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("reading yaml job files requires PyYAML, install it with 'pip install jira-agile-toolbox[yaml]'")
+            content = yaml.safe_load(job_file)
+        else:
+            content = json.load(job_file)
+    return content["jobs"] if isinstance(content, dict) else content
+
+
+def _validate_jobs(jobs):
+    ids = set()
+    for index, job in enumerate(jobs):
+        operation = job.get("op")
+        if operation not in OPERATIONS:
+            raise ValueError(f"job {index}: unknown op {operation!r}, should be one of {', '.join(OPERATIONS)}")
+        missing = [argument for argument in OPERATIONS[operation][1] if argument not in job]
+        if missing:
+            raise ValueError(f"job {index}: {operation} needs {', '.join(missing)}")
+        # a job without an id is known by its index, an explicit id may not collide with that
+        job_id = job.get("id", index)
+        if job_id in ids:
+            raise ValueError(f"job {index}: id {job_id!r} is used by another job")
+        ids.add(job_id)
+    for index, job in enumerate(jobs):
+        unknown = [job_id for job_id in job.get("after", []) if job_id not in ids]
+        if unknown:
+            raise ValueError(f"job {index}: after refers to unknown jobs {unknown}")
+
+
+def _resource_of(job):
+    if job["op"] in ("rank", "rank_at_top"):
+        return "rank"
+    return job["epic"]
+
+
+def _dependencies(jobs):
+    index_of_id = {job.get("id", index): index for index, job in enumerate(jobs)}
+    last_job_on_resource = {}
+    dependencies = []
+    for index, job in enumerate(jobs):
+        depends_on = {index_of_id[job_id] for job_id in job.get("after", [])}
+        resource = _resource_of(job)
+        if resource in last_job_on_resource:
+            depends_on.add(last_job_on_resource[resource])
+        last_job_on_resource[resource] = index
+        dependencies.append(depends_on)
+
+    resolved = set()
+    while len(resolved) < len(jobs):
+        resolvable = {index for index in range(len(jobs)) if index not in resolved and dependencies[index] <= resolved}
+        if not resolvable:
+            circular = [jobs[index].get("id", index) for index in range(len(jobs)) if index not in resolved]
+            raise ValueError(f"circular dependencies between jobs {circular}")
+        resolved |= resolvable
+    return dependencies
+
+
+def run_jobs(toolbox, jobs, max_workers=None, journal=None):
+    """
+    runs the jobs with one shared toolbox, independent jobs run concurrently
+
+    :param toolbox: the toolbox to run the jobs with
+    :type toolbox: JiraAgileToolBox
+    :param jobs: a list of jobs as returned by :func:`load_jobs`
+    :type jobs: list
+    :param max_workers: the number of jobs to run at the same time (defaults to the max_workers of the toolbox)
+    :type max_workers: int
+    :param journal: passed on to the label, fixVersion and rank jobs so a rerun of the same job file skips the work already done
+    :type journal: jira_agile_toolbox.journal.Journal
+    :return: per job, in the order of the jobs, a dict with its id, op, status ("done", "failed" or "skipped") and result or error
+    :rtype: list
+
+    ``Example``
+
+        .. code-block:: python
+
+            >>> from jira_agile_toolbox import JiraAgileToolBox
+            >>> from jira_agile_toolbox.jobs import load_jobs, run_jobs
+            >>> tb = JiraAgileToolBox.from_server("https://my-jira-server.com", basic_auth=("MYUSERNAME","MYPASSWORD"))
+            >>> run_jobs(tb, load_jobs("nightly.yaml"))
+            [{'id': 'points', 'op': 'storypoints', 'status': 'done', 'result': {'total': 100, 'Reported': 50, 'Closed': 50}}, ...]
+    """
+    _validate_jobs(jobs)
+    if any(job["op"] == "storypoints" for job in jobs):
+        toolbox._get_story_points_custom_field()
+
+    dependencies = _dependencies(jobs)
+    results = [{"id": job.get("id", index), "op": job["op"]} for index, job in enumerate(jobs)]
+    pending = set(range(len(jobs)))
+    running = {}
+    with ThreadPoolExecutor(max_workers=max_workers or toolbox._max_workers) as executor:
+        while pending or running:
+            progressed = False
+            for index in sorted(pending):
+                statuses = [results[dependency].get("status") for dependency in dependencies[index]]
+                if any(status in ("failed", "skipped") for status in statuses):
+                    results[index]["status"] = "skipped"
+                    pending.discard(index)
+                    progressed = True
+                elif all(status == "done" for status in statuses):
+                    job = jobs[index]
+                    running[executor.submit(OPERATIONS[job["op"]][0], toolbox, job, journal)] = index
+                    pending.discard(index)
+            if not running:
+                if progressed:
+                    continue
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = running.pop(future)
+                try:
+                    results[index]["result"] = future.result()
+                    results[index]["status"] = "done"
+                except Exception as error:
+                    results[index]["error"] = str(error)
+                    results[index]["status"] = "failed"
+    return results
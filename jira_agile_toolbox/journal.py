@@ -0,0 +1,93 @@
+"""
+an on-disk journal of the issues a bulk operation already handled
+
+pass a :class:`Journal` to the propagation and ranking methods of the toolbox and a rerun after a failure skips every issue
+which was already updated.
+"""
+
+import os
+import threading
+
+DEFAULT_BATCH_SIZE = 100
+
+
+class Journal:
+    """
+    an append only file which records, per operation, the keys of the issues that are done
+
+    keys are buffered in memory and written in batches, the buffer is also written when the operation ends, also when it fails
+
+    :param path: the journal file, it is created if it does not exist yet
+    :type path: str
+    :param batch_size: the number of keys to buffer before they are written to disk (defaults to 100)
+    :type batch_size: int
+
+    ``Example``
+
+        .. code-block:: python
+
+            >>> from jira_agile_toolbox import JiraAgileToolBox
+            >>> from jira_agile_toolbox.journal import Journal
+            >>> tb = JiraAgileToolBox(my_jira_client)
+            >>> with Journal("fix_versions.journal") as journal:
+            ...     tb.copy_fix_version_from_epic_to_all_items_in_epic("JAT-001", journal=journal)
+    """
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE):
+        self._path = path
+        self._batch_size = batch_size
+        self._lock = threading.Lock()
+        self._done = set()
+        self._buffer = []
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as journal_file:
+                for line in journal_file:
+                    if "\t" in line:
+                        scope, key = line.rstrip("\n").split("\t", 1)
+                        self._done.add((scope, key))
+
+    def is_done(self, scope, key):
+        """
+        returns True when the issue was recorded as done for the operation
+
+        :param scope: identifies the operation e.g. "labels:JAT-001:label_to_set"
+        :type scope: str
+        :param key: the issue key
+        :type key: str
+        """
+        return (scope, key) in self._done
+
+    def mark_done(self, scope, key):
+        """
+        records the issue as done for the operation, the record is written to disk with the next batch
+
+        :param scope: identifies the operation e.g. "labels:JAT-001:label_to_set"
+        :type scope: str
+        :param key: the issue key
+        :type key: str
+        """
+        with self._lock:
+            self._done.add((scope, key))
+            self._buffer.append(f"{scope}\t{key}\n")
+            if len(self._buffer) >= self._batch_size:
+                self._write_buffer()
+
+    def flush(self):
+        """writes all buffered records to disk"""
+        with self._lock:
+            self._write_buffer()
+
+    def _write_buffer(self):
+        if not self._buffer:
+            return
+        with open(self._path, "a", encoding="utf-8") as journal_file:
+            journal_file.writelines(self._buffer)
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+        self._buffer = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
@@ -0,0 +1,77 @@
+"""
+sums story points per status over many epics using all cores of the client, see :meth:`JiraAgileToolBox.get_storypoints_from_epics`
+
+search pages are downloaded as raw bytes by a pool of threads and decoded and summed per epic by a pool of processes, only
+the small partial results are sent back and merged. The processes are spawned rather than forked as the downloading
+threads are already running when they start.
+"""
+
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+
+def _sum_story_points_of_page(epic_key, payload, story_points_field):
+    """decodes one raw search page and returns the epic key, the story points per status and the total of the search"""
+    page = json.loads(payload)
+    story_points_per_state = {}
+    for issue in page.get("issues", []):
+        fields = issue.get("fields") or {}
+        state = (fields.get("status") or {}).get("name")
+        story_points_per_state.setdefault(state, 0)
+        if fields.get(story_points_field):
+            story_points_per_state[state] += int(fields[story_points_field])
+    return epic_key, story_points_per_state, page.get("total", 0)
+
+
+def _merge(story_points_per_state, partial_story_points_per_state):
+    for state, story_points in partial_story_points_per_state.items():
+        story_points_per_state[state] = story_points_per_state.get(state, 0) + story_points
+
+
+def _pages_to_fetch(fetched_up_to, totals, page_size):
+    pages = []
+    for epic_key, total in totals.items():
+        start_ats = range(fetched_up_to[epic_key], total, page_size)
+        pages.extend((epic_key, start_at) for start_at in start_ats)
+        fetched_up_to[epic_key] += len(start_ats) * page_size
+    return pages
+
+
+def _fetch(fetch_page, epic_key, start_at, page_size):
+    return epic_key, fetch_page(epic_key, start_at, page_size)
+
+
+def sum_story_points_per_epic(count_issues, fetch_page, epic_keys, story_points_field, page_size, max_workers, processes=None):
+    """
+    returns the story points per status and their total for every epic
+
+    :param count_issues: called with an epic key, returns the number of issues the search of the epic finds
+    :param fetch_page: called with an epic key, a start index and a page size, returns the raw json search page as bytes
+    :param epic_keys: the epic keys
+    :param story_points_field: the id of the story points field
+    :param page_size: the number of issues per page
+    :param max_workers: the number of pages downloaded at the same time
+    :param processes: the number of processes decoding the pages (defaults to the number of cpus)
+    """
+    results = {epic_key: {} for epic_key in epic_keys}
+    decoders = ProcessPoolExecutor(max_workers=processes or os.cpu_count(), mp_context=multiprocessing.get_context("spawn"))
+    with ThreadPoolExecutor(max_workers=max_workers) as fetchers, decoders:
+        fetched_up_to = {epic_key: 0 for epic_key in epic_keys}
+        totals = dict(zip(epic_keys, fetchers.map(count_issues, epic_keys)))
+        pages = _pages_to_fetch(fetched_up_to, totals, page_size)
+        while pages:
+            fetched = [fetchers.submit(_fetch, fetch_page, epic_key, start_at, page_size) for epic_key, start_at in pages]
+            decoded = [decoders.submit(_sum_story_points_of_page, *page.result(), story_points_field) for page in as_completed(fetched)]
+            totals = {}
+            for partial_result in decoded:
+                epic_key, partial_story_points_per_state, total = partial_result.result()
+                _merge(results[epic_key], partial_story_points_per_state)
+                totals[epic_key] = max(total, totals.get(epic_key, 0))
+            # issues added to an epic while it is read are fetched in one more round
+            pages = _pages_to_fetch(fetched_up_to, totals, page_size)
+
+    for story_points_per_state in results.values():
+        story_points_per_state["total"] = sum(story_points_per_state.values())
+    return results
@@ -0,0 +1,157 @@
+"""
+an in-memory index of the rank order of a backlog, see :meth:`JiraAgileToolBox.get_backlog_rank_index`
+"""
+
+import bisect
+import threading
+
+# issues moved by the toolbox get a rank made of printable ascii characters which sorts between its new neighbours
+_LOWEST_CHARACTER = 0x21
+_HIGHEST_CHARACTER = 0x7E
+
+
+def rank_between(lower, upper):
+    """
+    returns a string which sorts after lower and before upper
+
+    the returned rank never ends with the lowest character so there is always room to rank another issue before it
+
+    :param lower: the rank to sort after or None for the top of the backlog
+    :param upper: the rank to sort before or None for the bottom of the backlog
+    """
+    result = []
+    index = 0
+    upper_bounded = upper is not None
+    while True:
+        low = ord(lower[index]) if lower is not None and index < len(lower) else _LOWEST_CHARACTER
+        high = ord(upper[index]) if upper_bounded and index < len(upper) else _HIGHEST_CHARACTER + 1
+        if high - low > 1:
+            result.append(chr((low + high) // 2))
+            return "".join(result)
+        result.append(chr(low))
+        upper_bounded = upper_bounded and high == low
+        index += 1
+
+
+class BacklogRankIndex:
+    """
+    the issue keys of a backlog in rank order together with their rank values
+
+    positions and relative order are answered with a binary search over the ranks. Moves done through the toolbox
+    update the index so it does not need to be downloaded again. The index can be read and updated from several threads.
+
+    :param project: the project key
+    :type project: str
+    :param ranked_issues: (issue key, rank) pairs in rank order
+    :type ranked_issues: list
+    """
+
+    def __init__(self, project, ranked_issues):
+        self.project = project
+        self._lock = threading.RLock()
+        self._keys = []
+        self._ranks = []
+        self._rank_of = {}
+        for key, rank in ranked_issues:
+            self._keys.append(key)
+            self._ranks.append(rank)
+            self._rank_of[key] = rank
+
+    def __len__(self):
+        with self._lock:
+            return len(self._keys)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._rank_of
+
+    def keys(self):
+        """returns the issue keys in rank order"""
+        with self._lock:
+            return list(self._keys)
+
+    def position(self, key):
+        """
+        returns the position of the issue in the backlog, 0 is the top
+
+        :param key: the issue key
+        :type key: str
+        :raises KeyError: when the issue is not in the backlog
+        """
+        with self._lock:
+            return bisect.bisect_left(self._ranks, self._rank_of[key])
+
+    def key_at(self, position):
+        """
+        returns the key of the issue at the position in the backlog
+
+        :param position: the position, 0 is the top
+        :type position: int
+        """
+        with self._lock:
+            return self._keys[position]
+
+    def is_ranked_before(self, key, other_key):
+        """
+        returns True when the first issue is ranked higher than the second one
+
+        :param key: the issue key
+        :type key: str
+        :param other_key: the other issue key
+        :type other_key: str
+        """
+        with self._lock:
+            return self._rank_of[key] < self._rank_of[other_key]
+
+    def is_ordered(self, keys):
+        """
+        returns True when the issues are ranked in the given order, index 0 being the highest ranked
+
+        :param keys: issue keys
+        :type keys: list
+        """
+        with self._lock:
+            ranks = [self._rank_of[key] for key in keys]
+            return all(rank < next_rank for rank, next_rank in zip(ranks, ranks[1:]))
+
+    def top(self, exclude=()):
+        """
+        returns the key of the highest ranked issue which is not excluded or None
+
+        :param exclude: issue keys to skip
+        :type exclude: list
+        """
+        with self._lock:
+            excluded = set(exclude)
+            for key in self._keys:
+                if key not in excluded:
+                    return key
+            return None
+
+    def move_before(self, key, next_key):
+        """
+        records that the issue was ranked right before next_key, issues outside the backlog are ignored
+
+        :param key: the issue key which was moved
+        :type key: str
+        :param next_key: the issue key it was moved before
+        :type next_key: str
+        """
+        with self._lock:
+            if key not in self._rank_of or next_key not in self._rank_of or key == next_key:
+                return
+            self._remove(key)
+            next_position = self.position(next_key)
+            previous_rank = self._ranks[next_position - 1] if next_position else None
+            self._insert(next_position, key, rank_between(previous_rank, self._ranks[next_position]))
+
+    def _remove(self, key):
+        position = self.position(key)
+        del self._keys[position]
+        del self._ranks[position]
+        del self._rank_of[key]
+
+    def _insert(self, position, key, rank):
+        self._keys.insert(position, key)
+        self._ranks.insert(position, rank)
+        self._rank_of[key] = rank
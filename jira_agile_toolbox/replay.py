@@ -0,0 +1,262 @@
+"""
+records the http traffic of a jira client to a cassette file and replays it offline
+
+a cassette holds the request/response pairs of a session together with the time each response took. Credentials and cookies are
+left out while recording and extra patterns (e.g. e-mail addresses or the server name) can be redacted. Replaying serves the
+recorded responses in order, optionally with their original latency, so toolbox methods can be profiled and regression
+tested against realistic payloads without a jira server. Requests are matched after the redaction of their recording, so
+a cassette recorded with redact patterns is replayed with the same patterns.
+
+``Example``
+
+    .. code-block:: python
+
+        >>> from jira_agile_toolbox import JiraAgileToolBox
+        >>> from jira_agile_toolbox.replay import record, replay_client, profile
+        >>> tb = JiraAgileToolBox.from_server("https://my-jira-server.com", basic_auth=("MYUSERNAME","MYPASSWORD"))
+        >>> with record(tb._jira_client._session, "storypoints.json", redact=[r"[\\w.]+@example\\.com"]):
+        ...     tb.get_storypoints_from_epic("JAT-001")
+        >>> tb = JiraAgileToolBox(replay_client("storypoints.json", timing=False, redact=[r"[\\w.]+@example\\.com"]))
+        >>> profile(tb, tb.get_storypoints_from_epic, "JAT-001")
+        {'result': {'total': 100, 'Reported': 50, 'Closed': 50}, 'requests': 2, 'cpu_time': 0.012, 'peak_memory': 181233}
+"""
+
+import contextlib
+import json
+import re
+import threading
+import time
+import tracemalloc
+from urllib.parse import parse_qsl, urlsplit
+
+from requests import Response
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+REDACTED = "REDACTED"
+REDACTED_HEADERS = ("Authorization", "Cookie", "Proxy-Authorization")
+_REDACTED_HEADERS = {name.lower() for name in REDACTED_HEADERS}
+RECORDED_RESPONSE_HEADERS = ("Content-Type", "X-AREQUESTID", "X-Seraph-LoginReason")
+REPLAY_SERVER = "https://jira.replay"
+
+
+def _request_key(method, url, body):
+    # the server is left out so a cassette can be replayed against any url, the query parameters are compared unordered
+    parts = urlsplit(url)
+    return method.upper(), parts.path, tuple(sorted(parse_qsl(parts.query, keep_blank_values=True))), body or ""
+
+
+def _redact(patterns, text):
+    for pattern in patterns:
+        text = pattern.sub(REDACTED, text)
+    return text
+
+
+def _text(body):
+    if isinstance(body, bytes):
+        return body.decode("utf-8", errors="replace")
+    return body or ""
+
+
+class RecordingAdapter(BaseAdapter):
+    """
+    a requests adapter which sends requests with another adapter and records every request/response pair
+
+    :param adapter: the adapter which really sends the requests (defaults to a new HTTPAdapter)
+    :type adapter: requests.adapters.BaseAdapter
+    :param redact: regular expressions whose matches are replaced by "REDACTED" in urls, headers and bodies
+    :type redact: list
+    """
+
+    def __init__(self, adapter=None, redact=()):
+        super().__init__()
+        self._adapter = adapter or HTTPAdapter()
+        self._patterns = [re.compile(pattern) for pattern in redact]
+        self._lock = threading.Lock()
+        self.interactions = []
+
+    def _redact(self, text):
+        return _redact(self._patterns, text)
+
+    def send(self, request, **kwargs):
+        started = time.perf_counter()
+        response = self._adapter.send(request, **kwargs)
+        # reading the content here makes the recorded time include the download of the body
+        content = response.content
+        elapsed = time.perf_counter() - started
+        interaction = {
+            "request": {
+                "method": request.method,
+                "url": self._redact(request.url),
+                "headers": {name: self._redact(value) for name, value in request.headers.items() if name.lower() not in _REDACTED_HEADERS},
+                "body": self._redact(_text(request.body)),
+            },
+            "response": {
+                "status": response.status_code,
+                "reason": response.reason,
+                "headers": {name: self._redact(response.headers[name]) for name in RECORDED_RESPONSE_HEADERS if name in response.headers},
+                "body": self._redact(_text(content)),
+            },
+            "elapsed": round(elapsed, 6),
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+        return response
+
+    def save(self, path):
+        """
+        writes the recorded interactions to a cassette file
+
+        :param path: the cassette file
+        :type path: str
+        """
+        with self._lock:
+            cassette = {"interactions": list(self.interactions)}
+        with open(path, "w", encoding="utf-8") as cassette_file:
+            json.dump(cassette, cassette_file, indent=1)
+
+    def close(self):
+        self._adapter.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    a requests adapter which answers requests with the responses of a cassette instead of sending them
+
+    every recorded response is served once, in the recorded order of the identical requests. A request which was not
+    recorded (or asked for more often than recorded) raises a ValueError. Requests are redacted like while recording
+    before they are looked up in the cassette.
+
+    :param path: the cassette file
+    :type path: str
+    :param timing: when True every response waits as long as it took while recording (defaults to True)
+    :type timing: bool
+    :param speed: divides the recorded waiting times, 2 replays twice as fast (defaults to 1)
+    :type speed: float
+    :param redact: the regular expressions the cassette was recorded with
+    :type redact: list
+    """
+
+    def __init__(self, path, timing=True, speed=1, redact=()):
+        super().__init__()
+        with open(path, encoding="utf-8") as cassette_file:
+            interactions = json.load(cassette_file)["interactions"]
+        self._timing = timing
+        self._speed = speed
+        self._patterns = [re.compile(pattern) for pattern in redact]
+        self._lock = threading.Lock()
+        self._responses = {}
+        for interaction in interactions:
+            request = interaction["request"]
+            key = _request_key(request["method"], request["url"], request["body"])
+            self._responses.setdefault(key, []).append(interaction)
+        self.requests = 0
+
+    def send(self, request, **kwargs):
+        key = _request_key(request.method, _redact(self._patterns, request.url), _redact(self._patterns, _text(request.body)))
+        with self._lock:
+            recorded = self._responses.get(key)
+            if not recorded:
+                raise ValueError(f"no recorded response for {request.method} {request.url}")
+            interaction = recorded.pop(0)
+            self.requests += 1
+        if self._timing:
+            time.sleep(interaction["elapsed"] / self._speed)
+
+        recorded_response = interaction["response"]
+        response = Response()
+        response.status_code = recorded_response["status"]
+        response.reason = recorded_response.get("reason")
+        response.headers = CaseInsensitiveDict(recorded_response.get("headers", {}))
+        response._content = recorded_response["body"].encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def unused(self):
+        """returns the number of recorded responses which were not replayed"""
+        with self._lock:
+            return sum(len(recorded) for recorded in self._responses.values())
+
+    def close(self):
+        pass
+
+
+@contextlib.contextmanager
+def record(session, path, redact=()):
+    """
+    records all traffic of the session while the block runs and writes it to a cassette file, also when the block fails
+
+    :param session: the session to record, for a jira.JIRA instance this is ``jira_client._session``
+    :type session: requests.Session
+    :param path: the cassette file
+    :type path: str
+    :param redact: regular expressions whose matches are replaced by "REDACTED" in urls, headers and bodies
+    :type redact: list
+    """
+    original_adapters = dict(session.adapters)
+    # the https adapter of the session sends plain http just as well
+    recorder = RecordingAdapter(session.get_adapter("https://"), redact=redact)
+    session.mount("https://", recorder)
+    session.mount("http://", recorder)
+    try:
+        yield recorder
+    finally:
+        session.adapters.clear()
+        session.adapters.update(original_adapters)
+        recorder.save(path)
+
+
+def replay_client(path, timing=True, speed=1, redact=()):
+    """
+    creates a jira.JIRA client which is served from a cassette file, it never connects to a server
+
+    :param path: the cassette file
+    :type path: str
+    :param timing: when True every response waits as long as it took while recording (defaults to True)
+    :type timing: bool
+    :param speed: divides the recorded waiting times, 2 replays twice as fast (defaults to 1)
+    :type speed: float
+    :param redact: the regular expressions the cassette was recorded with
+    :type redact: list
+    :return: a jira.JIRA instance, its adapter is available as ``jira_client._session.get_adapter(REPLAY_SERVER)``
+    :rtype: jira.JIRA
+    """
+    import jira
+
+    jira_client = jira.JIRA(REPLAY_SERVER, get_server_info=False)
+    adapter = ReplayAdapter(path, timing=timing, speed=speed, redact=redact)
+    # recorded issues link to the server they were recorded from, requests to any server are answered from the cassette
+    jira_client._session.mount("https://", adapter)
+    jira_client._session.mount("http://", adapter)
+    return jira_client
+
+
+def profile(toolbox, function, *args, **kwargs):
+    """
+    calls the function and measures the requests the toolbox' replay client served, the cpu time and the peak memory
+
+    :param toolbox: a toolbox created with a :func:`replay_client`
+    :type toolbox: JiraAgileToolBox
+    :param function: the toolbox method to profile
+    :return: a dictionary with the result of the call, the number of requests, the cpu time in seconds and the peak of
+        memory allocated during the call in bytes
+    :rtype: dict
+    """
+    adapter = toolbox._jira_client._session.get_adapter(REPLAY_SERVER)
+    requests_before = adapter.requests
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    cpu_started = time.process_time()
+    try:
+        result = function(*args, **kwargs)
+        cpu_time = time.process_time() - cpu_started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return {"result": result, "requests": adapter.requests - requests_before, "cpu_time": cpu_time, "peak_memory": peak - baseline}
@@ -0,0 +1,61 @@
+"""
+coalesces identical calls which are in flight at the same time, e.g. the same search started by several threads
+"""
+
+import copy
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    runs a function only once for all threads which ask for the same key while it runs
+
+    the thread which comes first does the call, the others wait for it and get a shallow copy of its result or the same
+    exception. Once the call is finished the next call with that key runs again.
+
+    ``Example``
+
+        .. code-block:: python
+
+            >>> single_flight = SingleFlight()
+            >>> single_flight.do(("search", jql_query), jira_client.search_issues, jql_query)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, function, *args, **kwargs):
+        """
+        returns function(*args, **kwargs), shared with the identical call which is already running if there is one
+
+        :param key: identifies the call, must be hashable
+        :param function: the function to call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.copy(call.result)
+        try:
+            call.result = function(*args, **kwargs)
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
@@ -0,0 +1,128 @@
+"""
+helpers to tune the HTTP transport used by the jira client
+
+the default requests session keeps at most 10 connections per host, which becomes the bottleneck as soon as the toolbox is
+used from several threads. The helpers in this module mount an adapter with a connection pool sized to the toolbox'
+concurrency, negotiate compressed responses and keep track of how often connections are reused.
+"""
+
+import threading
+
+from requests.adapters import HTTPAdapter
+
+from jira_agile_toolbox import DEFAULT_MAX_WORKERS
+
+ACCEPTED_ENCODINGS = "gzip, deflate"
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    a requests adapter which keeps connections alive in a pool of a fixed size and counts how they are used
+
+    :param pool_size: the maximum number of connections kept open per host, should match the number of threads using the client
+    :type pool_size: int
+    :param pool_block: when True requests wait for a free connection instead of opening one that is thrown away afterwards
+    :type pool_block: bool
+    """
+
+    def __init__(self, pool_size=DEFAULT_MAX_WORKERS, pool_block=True, **kwargs):
+        self._pool_size = pool_size
+        self._stats_lock = threading.Lock()
+        self._in_flight = 0
+        self._requests = 0
+        self._pool_exhausted = 0
+        super().__init__(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=pool_block, **kwargs)
+
+    def send(self, request, **kwargs):
+        with self._stats_lock:
+            self._requests += 1
+            if self._in_flight >= self._pool_size:
+                self._pool_exhausted += 1
+            self._in_flight += 1
+        try:
+            return super().send(request, **kwargs)
+        finally:
+            with self._stats_lock:
+                self._in_flight -= 1
+
+    def stats(self):
+        """
+        returns how the connection pool has been used so far
+
+        :return: a dictionary with the number of requests sent, connections opened and reused, and how many requests found
+            the pool exhausted
+        :rtype: dict
+        """
+        connections_opened = 0
+        pools = self.poolmanager.pools
+        for pool_key in pools.keys():
+            pool = pools.get(pool_key)
+            if pool is not None:
+                connections_opened += pool.num_connections
+        with self._stats_lock:
+            return {
+                "pool_size": self._pool_size,
+                "requests": self._requests,
+                "connections_opened": connections_opened,
+                "connections_reused": max(self._requests - connections_opened, 0),
+                "pool_exhausted": self._pool_exhausted,
+            }
+
+
+def tune_session(session, pool_size=DEFAULT_MAX_WORKERS):
+    """
+    mounts a :class:`PooledHTTPAdapter` on a requests session and asks the server for compressed, kept alive responses
+
+    :param session: the session to tune, for a jira.JIRA instance this is ``jira_client._session``
+    :type session: requests.Session
+    :param pool_size: the maximum number of connections kept open per host
+    :type pool_size: int
+    :return: the mounted adapter
+    :rtype: PooledHTTPAdapter
+    """
+    adapter = PooledHTTPAdapter(pool_size=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Accept-Encoding"] = ACCEPTED_ENCODINGS
+    session.headers["Connection"] = "keep-alive"
+    return adapter
+
+
+def get_pooled_adapter(session):
+    """
+    returns the :class:`PooledHTTPAdapter` mounted on the session or None when the session was not tuned
+
+    :param session: a requests session
+    :type session: requests.Session
+    """
+    adapters = getattr(session, "adapters", None) or {}
+    for adapter in adapters.values():
+        if isinstance(adapter, PooledHTTPAdapter):
+            return adapter
+    return None
+
+
+def build_jira_client(server, max_workers=DEFAULT_MAX_WORKERS, **jira_kwargs):
+    """
+    creates a jira.JIRA client with a transport tuned for ``max_workers`` concurrent calls
+
+    :param server: the url of the jira server
+    :type server: str
+    :param max_workers: the number of threads which will use the client at the same time
+    :type max_workers: int
+    :param jira_kwargs: passed on to jira.JIRA e.g. basic_auth or token_auth
+    :return: a jira.JIRA instance
+    :rtype: jira.JIRA
+
+    ``Example``
+
+        .. code-block:: python
+
+            >>> from jira_agile_toolbox.transport import build_jira_client
+            >>> my_jira_client = build_jira_client("https://my-jira-server.com", max_workers=20, basic_auth=("MYUSERNAME","MYPASSWORD"))
+    """
+    import jira
+
+    jira_client = jira.JIRA(server, **jira_kwargs)
+    tune_session(jira_client._session, pool_size=max_workers)
+    return jira_client
@@ -0,0 +1,155 @@
+"""
+keeps an :class:`jira_agile_toolbox.cache.EpicCache` up to date with the webhooks jira sends when issues change
+
+register ``http://<host>:<port>/`` as a webhook in jira for the ``jira:issue_created``, ``jira:issue_updated`` and
+``jira:issue_deleted`` events:
+
+- deleted issues are removed from the cached searches
+- cached searches which found an updated issue are dropped, as well as the searches of the epics it moved from or to
+- cached searches of the epic a created issue belongs to are dropped
+"""
+
+import hashlib
+import hmac
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MAX_PAYLOAD_SIZE = 10 * 1024 * 1024
+EPIC_CHANGELOG_FIELDS = ("Epic Link", "Parent", "parent", "Epic Child")
+
+
+class WebhookReceiver:
+    """
+    a small http server which applies jira issue webhooks to an epic cache
+
+    :param cache: the cache to keep up to date
+    :type cache: jira_agile_toolbox.cache.EpicCache
+    :param host: the interface to listen on (defaults to localhost)
+    :type host: str
+    :param port: the port to listen on (defaults to 0, a free port)
+    :type port: int
+    :param secret: when given, only payloads signed with this secret in the X-Hub-Signature header are accepted
+    :type secret: str
+
+    ``Example``
+
+        .. code-block:: python
+
+            >>> from jira_agile_toolbox import JiraAgileToolBox
+            >>> from jira_agile_toolbox.cache import EpicCache
+            >>> from jira_agile_toolbox.webhook import WebhookReceiver
+            >>> cache = EpicCache()
+            >>> tb = JiraAgileToolBox(my_jira_client, cache=cache)
+            >>> with WebhookReceiver(cache, host="0.0.0.0", port=8080) as receiver:
+            ...     serve_dashboards(tb)
+    """
+
+    def __init__(self, cache, host="127.0.0.1", port=0, secret=None):
+        self._cache = cache
+        self._secret = secret.encode() if secret else None
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._thread = None
+
+    @property
+    def url(self):
+        """the url to register in jira"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def handle_event(self, payload):
+        """
+        applies one webhook payload to the cache
+
+        :param payload: the decoded json body jira sent
+        :type payload: dict
+        :return: the issue keys and epic keys which were removed or invalidated
+        :rtype: list
+        """
+        event = payload.get("webhookEvent", "")
+        issue = payload.get("issue") or {}
+        issue_key = issue.get("key")
+        if not issue_key:
+            return []
+        if event == "jira:issue_deleted":
+            self._cache.remove_issue(issue_key)
+            self._cache.invalidate_epic(issue_key)
+            return [issue_key]
+        if event not in ("jira:issue_updated", "jira:issue_created"):
+            return []
+
+        self._cache.invalidate_issue(issue_key)
+        epic_keys = self._referenced_epics(issue, payload.get("changelog") or {})
+        for epic_key in epic_keys:
+            self._cache.invalidate_epic(epic_key)
+        return [issue_key, *sorted(epic_keys)]
+
+    def _referenced_epics(self, issue, changelog):
+        cached_epics = self._cache.epics()
+        referenced = set()
+        for item in changelog.get("items", []):
+            if item.get("field") in EPIC_CHANGELOG_FIELDS:
+                referenced.update(str(item.get(name)) for name in ("from", "fromString", "to", "toString") if item.get(name))
+        for value in (issue.get("fields") or {}).values():
+            if isinstance(value, str):
+                referenced.add(value)
+            elif isinstance(value, dict) and isinstance(value.get("key"), str):
+                referenced.add(value["key"])
+        return referenced & cached_epics
+
+    def _is_signed(self, body, signature):
+        if not self._secret:
+            return True
+        expected = "sha256=" + hmac.new(self._secret, body, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, signature or "")
+
+    def _handler_class(self):
+        receiver = self
+
+        class WebhookHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                if length > MAX_PAYLOAD_SIZE:
+                    self._respond(413)
+                    return
+                body = self.rfile.read(length)
+                if not receiver._is_signed(body, self.headers.get("X-Hub-Signature")):
+                    self._respond(401)
+                    return
+                try:
+                    payload = json.loads(body)
+                except ValueError:
+                    self._respond(400)
+                    return
+                receiver.handle_event(payload if isinstance(payload, dict) else {})
+                self._respond(204)
+
+            def _respond(self, status):
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        return WebhookHandler
+
+    def start(self):
+        """starts serving in a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.1}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """stops serving and closes the socket"""
+        if self._thread:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
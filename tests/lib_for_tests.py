@@ -36,3 +36,48 @@ def __init__(self, story_points=None, status="Reported", labels=[], fix_versions
         self.update = Mock()
         self.__getattr__ = Mock()
         self.add_field_value = Mock()
+
+
+class LocalJsonServer:
+    """
+    a keep-alive capable http server on localhost which answers every request with the same json body or, when body is
+    a function, with the body it returns for the method, path and body of the request (None answers 204 No Content)
+    """
+
+    def __init__(self, body=b"{}"):
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                request_body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                response_body = body(self.command, self.path, request_body) if callable(body) else body
+                if response_body is None:
+                    self.send_response(204)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(response_body)))
+                self.end_headers()
+                self.wfile.write(response_body)
+
+            do_POST = do_PUT = do_GET
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,130 @@
+import unittest
+from unittest.mock import Mock
+
+import jira
+from lib_for_tests import DEFAULT_FIELDS_RETURN_VALUE, MockedJiraIssue
+
+from jira_agile_toolbox import JiraAgileToolBox
+
+SPRINT_FIELD = {
+    "id": "customfield_10020",
+    "name": "Sprint",
+    "custom": True,
+    "schema": {"type": "array", "items": "string", "custom": "com.pyxis.greenhopper.jira:gh-sprint", "customId": 10020},
+}
+
+
+def _named(name):
+    value = Mock()
+    value.name = name
+    return value
+
+
+def _issue(story_points=None, status="Reported", assignee=None, issuetype="Story", components=(), sprints=()):
+    issue = MockedJiraIssue(story_points, status)
+    issue.fields.assignee = Mock(displayName=assignee) if assignee else None
+    issue.fields.issuetype = _named(issuetype)
+    issue.fields.components = [_named(component) for component in components]
+    issue.fields.customfield_10020 = list(sprints)
+    return issue
+
+
+class TestAggregationsFromEpic(unittest.TestCase):
+    def setUp(self) -> None:
+        self.jira_client = Mock(spec=jira.JIRA)
+        self.jira_client.fields.return_value = DEFAULT_FIELDS_RETURN_VALUE + [SPRINT_FIELD]
+        self.jat = JiraAgileToolBox(self.jira_client)
+
+    def test_aggregations_only_get_the_fields_needed_for_the_dimensions_and_metrics(self):
+        # Given
+        self.jira_client.search_issues.return_value = []
+
+        # When
+        self.jat.get_aggregations_from_epic("PROJ001-001", ["status", ("assignee", "sprint"), "status"], metrics=["Story Points"])
+
+        # Then
+        self.jira_client.search_issues.assert_called_once_with(
+            "'parentEpic' = PROJ001-001", fields=["status", "assignee", "customfield_10020", "customfield_10282"], maxResults=0
+        )
+        self.jira_client.fields.assert_called_once()
+
+    def test_aggregations_count_issues_and_sum_metrics_per_group(self):
+        # Given
+        self.jira_client.search_issues.return_value = [
+            _issue(1, "Closed", assignee="Jef"),
+            _issue(2, "Closed", assignee="Jef"),
+            _issue(3, "Reported"),
+            _issue(None, "Reported", assignee="Jef"),
+        ]
+
+        # When
+        result = self.jat.get_aggregations_from_epic("PROJ001-001", ["status", "assignee"], metrics=["Story Points"])
+
+        # Then
+        self.assertEqual(
+            {
+                "status": {"Closed": {"count": 2, "Story Points": 3}, "Reported": {"count": 2, "Story Points": 3}},
+                "assignee": {"Jef": {"count": 3, "Story Points": 3}, None: {"count": 1, "Story Points": 3}},
+                "total": {"count": 4, "Story Points": 6},
+            },
+            result,
+        )
+
+    def test_a_grouping_asked_for_twice_counts_every_issue_once(self):
+        # Given
+        self.jira_client.search_issues.return_value = [_issue(3, "Closed")]
+
+        # When
+        result = self.jat.get_aggregations_from_epic("PROJ001-001", ["status", "status", ("status",)], metrics="Story Points")
+
+        # Then
+        self.assertEqual(
+            {"status": {"Closed": {"count": 1, "Story Points": 3}}, "total": {"count": 1, "Story Points": 3}},
+            result,
+        )
+
+    def test_aggregations_over_several_dimensions_are_keyed_by_tuples(self):
+        # Given
+        self.jira_client.search_issues.return_value = [
+            _issue(1, "Closed", issuetype="Bug"),
+            _issue(2, "Closed", issuetype="Story"),
+            _issue(3, "Closed", issuetype="Story"),
+        ]
+
+        # When
+        result = self.jat.get_aggregations_from_epic("PROJ001-001", [("status", "issuetype")])
+
+        # Then
+        self.assertEqual({("Closed", "Bug"): {"count": 1}, ("Closed", "Story"): {"count": 2}}, result[("status", "issuetype")])
+
+    def test_issues_with_several_components_or_sprints_count_for_each_of_them(self):
+        # Given
+        self.jira_client.search_issues.return_value = [
+            _issue(5, components=["backend", "frontend"], sprints=[_named("Sprint 1"), _named("Sprint 2")]),
+            _issue(
+                3, sprints=["com.atlassian.greenhopper.service.sprint.Sprint@1a2b[id=2,rapidViewId=1,state=ACTIVE,name=Sprint 2,goal=]"]
+            ),
+        ]
+
+        # When
+        result = self.jat.get_aggregations_from_epic("PROJ001-001", ["component", "sprint"], metrics="Story Points")
+
+        # Then
+        self.assertEqual(
+            {
+                "backend": {"count": 1, "Story Points": 5},
+                "frontend": {"count": 1, "Story Points": 5},
+                None: {"count": 1, "Story Points": 3},
+            },
+            result["component"],
+        )
+        self.assertEqual({"Sprint 1": {"count": 1, "Story Points": 5}, "Sprint 2": {"count": 2, "Story Points": 8}}, result["sprint"])
+
+    def test_aggregations_raise_an_exception_on_unknown_dimensions_or_fields(self):
+        self.assertRaisesRegex(
+            ValueError, "group_by should contain dimensions", self.jat.get_aggregations_from_epic, "PROJ001-001", "priority"
+        )
+        self.assertRaisesRegex(
+            ValueError, "no fields found for Velocity", self.jat.get_aggregations_from_epic, "PROJ001-001", "status", metrics=["Velocity"]
+        )
+        self.jira_client.search_issues.assert_not_called()
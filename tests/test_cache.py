@@ -0,0 +1,211 @@
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+import jira
+from lib_for_tests import DEFAULT_FIELDS_RETURN_VALUE, MockedJiraIssue
+
+from jira_agile_toolbox import JiraAgileToolBox
+from jira_agile_toolbox.cache import EpicCache
+
+
+def _issue(key, story_points=1, status="Reported"):
+    issue = MockedJiraIssue(story_points, status)
+    issue.key = key
+    return issue
+
+
+class TestEpicCache(unittest.TestCase):
+    def test_searches_expire_after_the_ttl(self):
+        # Given
+        cache = EpicCache(ttl=30)
+        with patch("jira_agile_toolbox.cache.time.monotonic", return_value=100.0):
+            cache.put("JAT-001", ["status"], "", [_issue("JAT-002")])
+
+        # When
+        with patch("jira_agile_toolbox.cache.time.monotonic", return_value=129.0):
+            before_expiry = cache.get("JAT-001", ["status"], "")
+        with patch("jira_agile_toolbox.cache.time.monotonic", return_value=130.0):
+            after_expiry = cache.get("JAT-001", ["status"], "")
+
+        # Then
+        self.assertEqual(["JAT-002"], [issue.key for issue in before_expiry])
+        self.assertIsNone(after_expiry)
+        self.assertEqual(0, len(cache))
+
+    def test_the_least_recently_used_search_is_dropped_when_the_cache_is_full(self):
+        # Given
+        cache = EpicCache(max_entries=2)
+        cache.put("JAT-001", None, "", [_issue("JAT-002")])
+        cache.put("JAT-010", None, "", [_issue("JAT-011")])
+        cache.get("JAT-001", None, "")
+
+        # When
+        cache.put("JAT-020", None, "", [_issue("JAT-021")])
+
+        # Then
+        self.assertEqual({"JAT-001", "JAT-020"}, cache.epics())
+
+    def test_searches_are_dropped_until_the_issues_fit_in_the_memory_bound(self):
+        # Given
+        cache = EpicCache(max_issues=3)
+        cache.put("JAT-001", None, "", [_issue("JAT-002"), _issue("JAT-003")])
+        cache.put("JAT-010", None, "", [_issue("JAT-011")])
+
+        # When
+        cache.put("JAT-020", None, "", [_issue("JAT-021"), _issue("JAT-022")])
+
+        # Then
+        self.assertEqual({"JAT-010", "JAT-020"}, cache.epics())
+
+    def test_a_search_larger_than_the_memory_bound_is_not_cached(self):
+        # Given
+        cache = EpicCache(max_issues=1)
+
+        # When
+        cache.put("JAT-001", None, "", [_issue("JAT-002"), _issue("JAT-003")])
+
+        # Then
+        self.assertIsNone(cache.get("JAT-001", None, ""))
+
+    def test_a_search_which_was_invalidated_while_it_ran_is_not_cached(self):
+        # Given
+        cache = EpicCache()
+        epic_generation = cache.start_search()
+        issue_generation = cache.start_search()
+        cache.invalidate_epic("JAT-001")
+        cache.invalidate_issue("JAT-011")
+
+        # When
+        cache.put("JAT-001", None, "", [_issue("JAT-002")], generation=epic_generation)
+        cache.put("JAT-010", None, "", [_issue("JAT-011")], generation=issue_generation)
+        cache.end_search()
+        cache.end_search()
+        cache.put("JAT-001", None, "", [_issue("JAT-002")], generation=cache.start_search())
+        cache.end_search()
+
+        # Then
+        self.assertIsNone(cache.get("JAT-010", None, ""))
+        self.assertEqual({"JAT-001"}, cache.epics())
+
+
+class TestToolboxInvalidatesTheCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.jira_client = Mock(spec=jira.JIRA)
+        self.jira_client.fields.return_value = DEFAULT_FIELDS_RETURN_VALUE
+        self.cache = EpicCache(ttl=60)
+        self.jat = JiraAgileToolBox(self.jira_client, cache=self.cache)
+        self.epic1_issues = [_issue("JAT-002"), _issue("JAT-003")]
+        self.epic10_issues = [_issue("JAT-011")]
+        self.jira_client.search_issues.side_effect = lambda jql, **kwargs: list(
+            self.epic1_issues if "JAT-001" in jql else self.epic10_issues
+        )
+        self.jat.get_storypoints_from_epic("JAT-001")
+        self.jat.get_storypoints_from_epic("JAT-010")
+
+    def test_repeated_story_point_requests_are_served_from_the_cache(self):
+        # Given
+        self.jira_client.search_issues.reset_mock()
+
+        # When
+        self.jat.get_storypoints_from_epic("JAT-001")
+        self.jat.get_storypoints_from_epic("JAT-010")
+
+        # Then
+        self.jira_client.search_issues.assert_not_called()
+
+    def test_an_invalidation_during_the_search_keeps_its_result_out_of_the_cache(self):
+        # Given
+        self.cache.clear()
+
+        def search_issues(jql, **kwargs):
+            self.cache.invalidate_epic("JAT-001")
+            return list(self.epic1_issues)
+
+        self.jira_client.search_issues.side_effect = search_issues
+
+        # When
+        self.jat.get_storypoints_from_epic("JAT-001")
+
+        # Then
+        self.assertEqual(0, len(self.cache))
+
+    def test_a_search_started_after_an_invalidation_does_not_share_the_request_of_an_older_search(self):
+        # Given
+        self.cache.clear()
+        stale_issues = [_issue("JAT-002", status="Reported")]
+        fresh_issues = [_issue("JAT-002", status="Closed")]
+        searching = threading.Event()
+        release = threading.Event()
+
+        def search_issues(jql, **kwargs):
+            if not searching.is_set():
+                searching.set()
+                release.wait(5)
+                return list(stale_issues)
+            return list(fresh_issues)
+
+        self.jira_client.search_issues.reset_mock()
+        self.jira_client.search_issues.side_effect = search_issues
+        thread_a = threading.Thread(target=self.jat.get_all_issues_in_epic, args=("JAT-001",))
+        thread_a.start()
+        searching.wait(5)
+        self.cache.invalidate_issue("JAT-002")
+
+        # When
+        thread_b = threading.Thread(target=self.jat.get_all_issues_in_epic, args=("JAT-001",))
+        thread_b.start()
+        time.sleep(0.2)
+        release.set()
+        thread_a.join(5)
+        thread_b.join(5)
+
+        # Then
+        self.assertEqual(2, self.jira_client.search_issues.call_count)
+        self.assertEqual(fresh_issues, self.cache.get("JAT-001", [], ""))
+
+    def test_adding_labels_invalidates_the_epic(self):
+        # When
+        self.jat.add_labels_to_all_sub_items_of_epic("JAT-001", "label")
+
+        # Then
+        self.assertEqual({"JAT-010"}, self.cache.epics())
+
+    def test_adding_labels_to_several_epics_invalidates_all_of_them(self):
+        # When
+        self.jat.add_labels_to_all_sub_items_of_epics(["JAT-001", "JAT-010"], "label")
+
+        # Then
+        self.assertEqual(set(), self.cache.epics())
+
+    def test_copying_fix_versions_invalidates_the_epic(self):
+        # Given
+        epic = Mock(spec=jira.Issue)
+        epic.key = "JAT-010"
+        epic.fields = Mock(fixVersions=[])
+
+        # When
+        self.jat.copy_fix_version_from_epic_to_all_items_in_epic(epic)
+
+        # Then
+        self.assertEqual({"JAT-001"}, self.cache.epics())
+
+    def test_ranking_invalidates_the_epics_of_the_ranked_issues(self):
+        # When
+        self.jat._rank_keys(["JAT-011"], "JAT-002")
+
+        # Then
+        self.assertEqual({"JAT-001"}, self.cache.epics())
+
+    def test_a_failing_update_still_invalidates_the_epic(self):
+        # Given
+        self.epic1_issues[1].update = Mock(side_effect=jira.JIRAError("update failed"))
+        self.jat.get_all_issues_in_epic("JAT-001", fields=["labels"])
+
+        # When
+        with self.assertRaises(jira.JIRAError):
+            self.jat.add_labels_to_all_sub_items_of_epic("JAT-001", "label", keep_already_present=False)
+
+        # Then
+        self.assertEqual({"JAT-010"}, self.cache.epics())
@@ -0,0 +1,160 @@
+import subprocess
+import sys
+import unittest
+from unittest.mock import Mock, patch
+
+import jira
+from lib_for_tests import MockedJiraIssue
+
+from jira_agile_toolbox import JiraAgileToolBox, cli
+
+# generous upper bound for importing the command line module, importing jira alone takes several times longer
+MAX_CLI_IMPORT_TIME_US = 100_000
+
+
+def _run_with_importtime(*args):
+    return subprocess.run([sys.executable, "-X", "importtime", *args], capture_output=True, text=True)
+
+
+def _imported_modules(importtime_output):
+    """parses the output of -X importtime into a dict of module name to cumulative import time in microseconds"""
+    modules = {}
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+class TestCliStartup(unittest.TestCase):
+    def test_importing_the_cli_does_not_import_jira_or_requests(self):
+        # When
+        result = _run_with_importtime("-c", "import jira_agile_toolbox.cli")
+
+        # Then
+        modules = _imported_modules(result.stderr)
+        self.assertIn("jira_agile_toolbox.cli", modules)
+        self.assertNotIn("jira", modules)
+        self.assertNotIn("requests", modules)
+        self.assertNotIn("importlib.metadata", modules)
+
+    def test_importing_the_cli_is_fast(self):
+        # When
+        result = _run_with_importtime("-c", "import jira_agile_toolbox.cli")
+
+        # Then
+        modules = _imported_modules(result.stderr)
+        self.assertLess(modules["jira_agile_toolbox"] + modules["jira_agile_toolbox.cli"], MAX_CLI_IMPORT_TIME_US)
+
+    def test_help_returns_without_importing_jira(self):
+        # When
+        result = _run_with_importtime("-m", "jira_agile_toolbox.cli", "--help")
+
+        # Then
+        self.assertEqual(0, result.returncode)
+        self.assertIn("storypoints", result.stdout)
+        self.assertNotIn("jira", _imported_modules(result.stderr))
+
+    def test_argument_errors_return_without_importing_jira(self):
+        # When
+        result = _run_with_importtime("-m", "jira_agile_toolbox.cli", "rank", "JAT-001")
+
+        # Then
+        self.assertEqual(2, result.returncode)
+        self.assertNotIn("jira", _imported_modules(result.stderr))
+
+
+class TestCliCommands(unittest.TestCase):
+    def setUp(self) -> None:
+        self.toolbox = Mock(spec=JiraAgileToolBox)
+        self.toolbox._jira_client = Mock(spec=jira.JIRA)
+        patcher = patch.object(cli, "make_toolbox", return_value=self.toolbox)
+        self.make_toolbox = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_storypoints_prints_the_story_points_as_json(self):
+        # Given
+        self.toolbox.get_storypoints_from_epic.return_value = {"total": 3, "Closed": 3}
+
+        # When
+        with patch("builtins.print") as mocked_print:
+            exit_code = cli.main(["--server", "https://jira.example.com", "storypoints", "JAT-001", "--jql", "status != Closed"])
+
+        # Then
+        self.assertEqual(0, exit_code)
+        self.toolbox.get_storypoints_from_epic.assert_called_with("JAT-001", jql_query="status != Closed")
+        mocked_print.assert_called_with('{"total": 3, "Closed": 3}')
+
+    def test_label_adds_labels_to_the_epic(self):
+        # When
+        cli.main(["--server", "https://jira.example.com", "label", "JAT-001", "label1", "label2", "--replace"])
+
+        # Then
+        self.toolbox.add_labels_to_all_sub_items_of_epic.assert_called_with(
+            "JAT-001", ["label1", "label2"], keep_already_present=False, jql_query="", journal=None
+        )
+
+    def test_fix_version_copies_the_fix_versions_of_the_epic(self):
+        # When
+        cli.main(["--server", "https://jira.example.com", "fix-version", "JAT-001"])
+
+        # Then
+        self.toolbox.copy_fix_version_from_epic_to_all_items_in_epic.assert_called_with(
+            "JAT-001", keep_already_present=True, jql_query="", journal=None
+        )
+
+    def test_rank_at_top_of_project_ranks_the_issues_in_the_given_order(self):
+        # Given
+        issue1 = MockedJiraIssue()
+        issue1.key = "JAT-001"
+        issue3 = MockedJiraIssue()
+        issue3.key = "JAT-003"
+        self.toolbox._get_issues_by_keys.return_value = [issue1, issue3]
+
+        # When
+        cli.main(["--server", "https://jira.example.com", "rank", "JAT-001", "JAT-003", "--top-of-project", "JAT"])
+
+        # Then
+        self.toolbox.rank_issues_at_top_of_project.assert_called_with([issue1, issue3], "JAT", journal=None)
+
+    def test_rank_reports_unknown_issues(self):
+        # Given
+        self.toolbox._get_issues_by_keys.side_effect = ValueError("issues not found: JAT-001")
+
+        # When
+        with patch("sys.stderr"):
+            exit_code = cli.main(["--server", "https://jira.example.com", "rank", "JAT-001", "--on-top-of", "JAT-005"])
+
+        # Then
+        self.assertEqual(1, exit_code)
+        self.toolbox.rank_issues_by_list.assert_not_called()
+
+    def test_export_streams_the_epic_to_the_output_file(self):
+        # When
+        cli.main(
+            [
+                "--server",
+                "https://jira.example.com",
+                "export",
+                "JAT-001",
+                "--format",
+                "csv",
+                "--output",
+                "out.csv",
+                "--fields",
+                "summary,status",
+            ]
+        )
+
+        # Then
+        self.toolbox.export_epic.assert_called_with("JAT-001", "out.csv", format="csv", fields=["summary", "status"], jql_query="")
+
+    def test_the_server_is_required(self):
+        # When
+        with patch("sys.stderr"), patch.dict("os.environ", clear=True):
+            with self.assertRaises(SystemExit):
+                cli.main(["storypoints", "JAT-001"])
+
+        # Then
+        self.make_toolbox.assert_not_called()
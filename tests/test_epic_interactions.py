@@ -1,5 +1,5 @@
 from unittest import TestCase
-from unittest.mock import Mock
+from unittest.mock import Mock, call
 
 import jira
 import jira.resources
@@ -310,6 +310,29 @@ def test_get_issues_from_epic_allows_to_filter_an_extra_jql_query(self):
         )
 
 
+class TestGetIssuesInEpics(TestCase):
+    def setUp(self) -> None:
+        self.jira_client = Mock(spec=jira.JIRA)
+
+    def test_get_issues_from_epics_returns_issues_found_under_several_epics_once(self):
+        # Given
+        sub_issue1 = MockedJiraIssue()
+        sub_issue1.key = "PROJ001-002"
+        sub_issue2 = MockedJiraIssue()
+        sub_issue2.key = "PROJ001-003"
+        self.jira_client.search_issues.return_value = [sub_issue1, sub_issue2, sub_issue1]
+        jat = JiraAgileToolBox(self.jira_client)
+
+        # When
+        result = jat.get_all_issues_in_epics(["PROJ001-001", "PROJ001-010", "PROJ001-001"], fields="a_specific_field")
+
+        # Then
+        self.assertEqual([sub_issue1, sub_issue2], result)
+        self.jira_client.search_issues.assert_called_once_with(
+            "'parentEpic' in (PROJ001-001,PROJ001-010)", fields=["a_specific_field"], maxResults=0
+        )
+
+
 class TestSetVersionNumberForAllItemsInEpic(TestCase):
     def setUp(self) -> None:
         self.jira_client = Mock(spec=jira.JIRA)
@@ -423,3 +446,216 @@ def test_copy_fix_version_from_epic_to_all_items_in_epic_dont_keep_already_prese
 
         # Then
         sub_issue1.update.assert_called_with(fields={"fixVersions": [{"name": version1.name}]})
+
+    def test_copy_fix_version_from_epic_key_only_gets_the_fix_versions_of_the_epic(self):
+        # Given
+        epic = MockedJiraIssue()
+        epic.fields.fixVersions = []
+        epic.key = "PROJ001-001"
+        self.jira_client.issue.return_value = epic
+        self.jira_client.search_issues.return_value = []
+        jat = JiraAgileToolBox(self.jira_client)
+
+        # When
+        jat.copy_fix_version_from_epic_to_all_items_in_epic("PROJ001-001")
+
+        # Then
+        self.jira_client.issue.assert_called_once_with("PROJ001-001", fields="fixVersions")
+
+
+class TestSetVersionNumberForAllItemsInMultipleEpics(TestCase):
+    def setUp(self) -> None:
+        self.jira_client = Mock(spec=jira.JIRA)
+        self.jira_client.project_versions.side_effect = lambda project: [
+            jira.resources.Version(None, None, {**VERSION_RAW, "id": f"{project}-31063"})
+        ]
+
+    @staticmethod
+    def _issue(key, project="PROJ001", fix_versions=()):
+        issue = MockedJiraIssue(fix_versions=[jira.resources.Version(None, None, raw) for raw in fix_versions])
+        issue.key = key
+        issue.fields.project.key = project
+        return issue
+
+    def test_copy_fix_versions_from_epics_gets_the_versions_of_all_epics_with_one_search(self):
+        # Given
+        epic1 = self._issue("PROJ001-001", fix_versions=[VERSION_RAW])
+        epic2 = self._issue("PROJ001-010", fix_versions=[VERSION_RAW])
+        self.jira_client.search_issues.side_effect = [[epic1, epic2], []]
+        jat = JiraAgileToolBox(self.jira_client)
+
+        # When
+        jat.copy_fix_version_from_epics_to_all_items_in_epics(["PROJ001-001", "PROJ001-010"])
+
+        # Then
+        self.jira_client.issue.assert_not_called()
+        self.jira_client.search_issues.assert_has_calls(
+            [
+                call("key in (PROJ001-001,PROJ001-010)", fields=["fixVersions"], maxResults=0),
+                call("'parentEpic' in (PROJ001-001,PROJ001-010)", fields=["fixVersions", "project"], maxResults=0),
+            ]
+        )
+
+    def test_copy_fix_versions_from_epics_sends_one_update_per_issue_with_version_ids_of_its_project(self):
+        # Given
+        epic = self._issue("PROJ001-001", fix_versions=[VERSION_RAW])
+        sub_issue1 = self._issue("PROJ001-002")
+        sub_issue2 = self._issue("PROJ002-002", project="PROJ002")
+        self.jira_client.search_issues.side_effect = [[epic], [sub_issue1, sub_issue2]]
+        jat = JiraAgileToolBox(self.jira_client)
+
+        # When
+        jat.copy_fix_version_from_epics_to_all_items_in_epics(["PROJ001-001"])
+
+        # Then
+        sub_issue1.update.assert_called_once_with(update={"fixVersions": [{"add": {"id": "PROJ001-31063"}}]})
+        sub_issue2.update.assert_called_once_with(update={"fixVersions": [{"add": {"id": "PROJ002-31063"}}]})
+        sub_issue1.add_field_value.assert_not_called()
+
+    def test_copy_fix_versions_from_epics_resolves_the_versions_once_per_project(self):
+        # Given
+        epic = self._issue("PROJ001-001", fix_versions=[VERSION_RAW])
+        sub_issues = [self._issue(f"PROJ001-{i:03}") for i in range(2, 12)]
+        self.jira_client.search_issues.side_effect = [[epic], sub_issues]
+        jat = JiraAgileToolBox(self.jira_client)
+
+        # When
+        jat.copy_fix_version_from_epics_to_all_items_in_epics([epic.key])
+
+        # Then
+        self.jira_client.project_versions.assert_called_once_with("PROJ001")
+
+    def test_copy_fix_versions_from_epics_uses_the_given_epic_issues_without_searching_them(self):
+        # Given
+        epic = self._issue("PROJ001-001", fix_versions=[VERSION_RAW])
+        sub_issue = self._issue("PROJ001-002")
+        self.jira_client.search_issues.return_value = [sub_issue]
+        jat = JiraAgileToolBox(self.jira_client)
+
+        # When
+        jat.copy_fix_version_from_epics_to_all_items_in_epics([epic], keep_already_present=False)
+
+        # Then
+        self.jira_client.search_issues.assert_called_once_with(
+            "'parentEpic' in (PROJ001-001)", fields=["fixVersions", "project"], maxResults=0
+        )
+        sub_issue.update.assert_called_once_with(fields={"fixVersions": [{"id": "PROJ001-31063"}]})
+
+    def test_copy_fix_versions_from_epics_refers_by_name_to_versions_unknown_in_the_project(self):
+        # Given
+        epic = self._issue("PROJ001-001", fix_versions=[{**VERSION_RAW, "name": "JAT 0.1.0"}])
+        sub_issue = self._issue("PROJ001-002")
+        self.jira_client.search_issues.return_value = [sub_issue]
+        jat = JiraAgileToolBox(self.jira_client)
+
+        # When
+        jat.copy_fix_version_from_epics_to_all_items_in_epics([epic])
+
+        # Then
+        sub_issue.update.assert_called_once_with(update={"fixVersions": [{"add": {"name": "JAT 0.1.0"}}]})
+
+    def test_copy_fix_versions_from_epics_searches_epics_with_different_versions_separately(self):
+        # Given
+        epic1 = self._issue("PROJ001-001", fix_versions=[VERSION_RAW])
+        epic2 = self._issue("PROJ001-010", fix_versions=[{**VERSION_RAW, "name": "JAT 0.1.0"}])
+        epic3 = self._issue("PROJ001-020", fix_versions=[VERSION_RAW])
+        self.jira_client.search_issues.return_value = []
+        jat = JiraAgileToolBox(self.jira_client)
+
+        # When
+        jat.copy_fix_version_from_epics_to_all_items_in_epics([epic1, epic2, epic3], jql_query="status != Closed")
+
+        # Then
+        self.jira_client.search_issues.assert_has_calls(
+            [
+                call("'parentEpic' in (PROJ001-001,PROJ001-020) AND status != Closed", fields=["fixVersions", "project"], maxResults=0),
+                call("'parentEpic' in (PROJ001-010) AND status != Closed", fields=["fixVersions", "project"], maxResults=0),
+            ]
+        )
+
+    def test_copy_fix_versions_from_epics_gives_an_issue_under_epics_with_different_versions_all_of_them_at_once(self):
+        # Given
+        epic1 = self._issue("PROJ001-001", fix_versions=[VERSION_RAW])
+        epic2 = self._issue("PROJ001-010", fix_versions=[{**VERSION_RAW, "name": "JAT 0.1.0"}])
+        sub_issue = self._issue("PROJ001-002")
+        self.jira_client.search_issues.side_effect = lambda jql, **kwargs: [sub_issue]
+        jat = JiraAgileToolBox(self.jira_client)
+
+        # When
+        jat.copy_fix_version_from_epics_to_all_items_in_epics([epic1, epic2])
+
+        # Then
+        sub_issue.update.assert_called_once_with(update={"fixVersions": [{"add": {"id": "PROJ001-31063"}}, {"add": {"name": "JAT 0.1.0"}}]})
+
+    def test_copy_fix_versions_from_epics_raises_before_updating_anything_when_an_epic_is_not_found(self):
+        # Given
+        epic = self._issue("PROJ001-001", fix_versions=[VERSION_RAW])
+        self.jira_client.search_issues.return_value = [epic]
+        jat = JiraAgileToolBox(self.jira_client)
+
+        # When / Then
+        with self.assertRaisesRegex(ValueError, "issues not found: PROJ001-999"):
+            jat.copy_fix_version_from_epics_to_all_items_in_epics(["PROJ001-001", "PROJ001-999"])
+        self.jira_client.search_issues.assert_called_once_with("key in (PROJ001-001,PROJ001-999)", fields=["fixVersions"], maxResults=0)
+
+
+class TestCountIssuesInEpic(TestCase):
+    def setUp(self) -> None:
+        self.jira_client = Mock(spec=jira.JIRA)
+        issue_type = Mock()
+        issue_type.statuses = [Mock(), Mock(), Mock()]
+        for status, name in zip(issue_type.statuses, ["Reported", "In Progress", "Closed"]):
+            status.name = name
+        self.jira_client.issue_types_for_project.return_value = [issue_type, issue_type]
+        self.totals = {
+            "'parentEpic' = PROJ001-001": 5,
+            "'parentEpic' = PROJ001-001 AND status = \"Reported\"": 3,
+            "'parentEpic' = PROJ001-001 AND status = \"In Progress\"": 0,
+            "'parentEpic' = PROJ001-001 AND status = \"Closed\"": 2,
+        }
+        self.jira_client.search_issues.side_effect = lambda jql, **kwargs: {"startAt": 0, "maxResults": 1, "total": self.totals[jql]}
+
+    def test_count_issues_in_epic_only_reads_the_total_of_the_search(self):
+        # Given
+        jat = JiraAgileToolBox(self.jira_client)
+
+        # When
+        result = jat.count_issues_in_epic("PROJ001-001")
+
+        # Then
+        self.assertEqual(5, result)
+        self.jira_client.search_issues.assert_called_once_with("'parentEpic' = PROJ001-001", fields=["key"], maxResults=1, json_result=True)
+
+    def test_count_issues_in_epic_by_status_counts_per_status_of_the_project(self):
+        # Given
+        jat = JiraAgileToolBox(self.jira_client)
+
+        # When
+        result = jat.count_issues_in_epic_by_status("PROJ001-001")
+
+        # Then
+        self.assertEqual({"total": 5, "Reported": 3, "Closed": 2}, result)
+        self.jira_client.issue_types_for_project.assert_called_once_with("PROJ001")
+        self.assertEqual(4, self.jira_client.search_issues.call_count)
+
+    def test_count_issues_in_epic_by_status_passes_on_a_jql_query(self):
+        # Given
+        self.totals = {f"{jql} AND issuetype = Bug": total for jql, total in self.totals.items()}
+        jat = JiraAgileToolBox(self.jira_client)
+
+        # When
+        result = jat.count_issues_in_epic_by_status("PROJ001-001", jql_query="issuetype = Bug")
+
+        # Then
+        self.assertEqual({"total": 5, "Reported": 3, "Closed": 2}, result)
+
+    def test_count_issues_in_epic_by_status_gets_the_statuses_of_a_project_only_once(self):
+        # Given
+        jat = JiraAgileToolBox(self.jira_client)
+
+        # When
+        jat.count_issues_in_epic_by_status("PROJ001-001", projects=["PROJ001"])
+        jat.count_issues_in_epic_by_status("PROJ001-001", projects="PROJ001")
+
+        # Then
+        self.jira_client.issue_types_for_project.assert_called_once_with("PROJ001")
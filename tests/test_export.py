@@ -0,0 +1,134 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import Mock
+
+import jira
+import pytest
+
+from jira_agile_toolbox import JiraAgileToolBox
+
+
+def _raw_issue(number, status="Reported", labels=()):
+    return {
+        "key": f"JAT-{number:03d}",
+        "fields": {"summary": f"issue {number}", "status": {"name": status, "id": "1"}, "labels": list(labels), "assignee": None},
+    }
+
+
+def _pages(*pages):
+    total = sum(len(page) for page in pages)
+    return [{"issues": page, "total": total, "startAt": 0} for page in pages]
+
+
+class TestExportEpic(unittest.TestCase):
+    def setUp(self) -> None:
+        self.jira_client = Mock(spec=jira.JIRA)
+        self.jat = JiraAgileToolBox(self.jira_client)
+
+    def test_export_writes_one_json_line_per_issue_with_the_projected_fields(self):
+        # Given
+        self.jira_client.search_issues.side_effect = _pages([_raw_issue(1, labels=["a", "b"])], [_raw_issue(2, "Closed")])
+        output = io.StringIO()
+
+        # When
+        exported = self.jat.export_epic("JAT-100", output, fields=["summary", "status", "labels"], page_size=1)
+
+        # Then
+        self.assertEqual(2, exported)
+        self.assertEqual(
+            [
+                {"key": "JAT-001", "summary": "issue 1", "status": "Reported", "labels": ["a", "b"]},
+                {"key": "JAT-002", "summary": "issue 2", "status": "Closed", "labels": []},
+            ],
+            [json.loads(line) for line in output.getvalue().splitlines()],
+        )
+        self.jira_client.search_issues.assert_called_with(
+            "'parentEpic' = JAT-100 ORDER BY key ASC", startAt=1, maxResults=1, fields=["summary", "status", "labels"], json_result=True
+        )
+
+    def test_export_to_csv_joins_lists_and_leaves_missing_values_empty(self):
+        # Given
+        self.jira_client.search_issues.side_effect = _pages([_raw_issue(1, labels=["a", "b"])])
+        path = os.path.join(tempfile.mkdtemp(), "export.csv")
+
+        # When
+        self.jat.export_epic("JAT-100", path, format="csv", fields=["status", "labels", "assignee"], jql_query="status != Closed")
+
+        # Then
+        with open(path, newline="", encoding="utf-8") as exported:
+            self.assertEqual([{"key": "JAT-001", "status": "Reported", "labels": "a;b", "assignee": ""}], list(csv.DictReader(exported)))
+        self.assertEqual("'parentEpic' = JAT-100 AND status != Closed ORDER BY key ASC", self.jira_client.search_issues.call_args[0][0])
+
+    def test_export_fetches_the_next_page_while_the_current_one_is_written(self):
+        # Given
+        second_page_fetched = threading.Event()
+        first_page = {"issues": [_raw_issue(1)], "total": 2}
+        second_page = {"issues": [_raw_issue(2)], "total": 2}
+
+        def search_issues(*args, startAt, **kwargs):
+            if startAt:
+                second_page_fetched.set()
+                return second_page
+            return first_page
+
+        self.jira_client.search_issues.side_effect = search_issues
+
+        class WaitingOutput(io.StringIO):
+            def writelines(self, lines):
+                if not self.getvalue():
+                    assert second_page_fetched.wait(5), "the second page was not fetched during the first write"
+                super().writelines(lines)
+
+        # When
+        exported = self.jat.export_epic("JAT-100", WaitingOutput(), page_size=1)
+
+        # Then
+        self.assertEqual(2, exported)
+
+    def test_export_raises_the_errors_of_the_search(self):
+        # Given
+        self.jira_client.search_issues.side_effect = jira.JIRAError("search failed")
+
+        # When / Then
+        with self.assertRaises(jira.JIRAError):
+            self.jat.export_epic("JAT-100", io.StringIO())
+
+    def test_export_rejects_unknown_formats(self):
+        # When / Then
+        with self.assertRaises(ValueError):
+            self.jat.export_epic("JAT-100", io.StringIO(), format="xml")
+        self.jira_client.search_issues.assert_not_called()
+
+    def test_export_to_parquet_writes_every_field_as_text(self):
+        # Given
+        pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+        self.jira_client.search_issues.side_effect = _pages([_raw_issue(1, labels=["a", "b"])], [_raw_issue(2, "Closed")])
+        path = os.path.join(tempfile.mkdtemp(), "export.parquet")
+
+        # When
+        exported = self.jat.export_epic("JAT-100", path, format="parquet", fields=["status", "labels", "assignee"], page_size=1)
+
+        # Then
+        self.assertEqual(2, exported)
+        self.assertEqual(
+            {"key": ["JAT-001", "JAT-002"], "status": ["Reported", "Closed"], "labels": ["a;b", ""], "assignee": [None, None]},
+            pyarrow_parquet.read_table(path).to_pydict(),
+        )
+
+    def test_export_accepts_the_epic_as_a_jira_issue(self):
+        # Given
+        epic = Mock(spec=jira.Issue)
+        epic.key = "JAT-100"
+        self.jira_client.search_issues.side_effect = _pages([])
+
+        # When
+        exported = self.jat.export_epic(epic, io.StringIO())
+
+        # Then
+        self.assertEqual(0, exported)
+        self.assertEqual("'parentEpic' = JAT-100 ORDER BY key ASC", self.jira_client.search_issues.call_args[0][0])
@@ -0,0 +1,168 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import Mock, call
+
+import jira
+from lib_for_tests import DEFAULT_FIELDS_RETURN_VALUE, MockedJiraIssue
+
+from jira_agile_toolbox import JiraAgileToolBox
+from jira_agile_toolbox.jobs import load_jobs, run_jobs
+
+
+class TestLoadJobs(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_load_jobs_reads_a_json_job_file(self):
+        # Given
+        path = os.path.join(self.directory.name, "jobs.json")
+        with open(path, "w") as job_file:
+            json.dump({"jobs": [{"op": "storypoints", "epic": "PROJ001-001"}]}, job_file)
+
+        # When
+        jobs = load_jobs(path)
+
+        # Then
+        self.assertEqual([{"op": "storypoints", "epic": "PROJ001-001"}], jobs)
+
+    def test_load_jobs_reads_a_yaml_job_file(self):
+        # Given
+        path = os.path.join(self.directory.name, "jobs.yaml")
+        with open(path, "w") as job_file:
+            job_file.write("jobs:\n  - op: add_labels\n    epic: PROJ001-001\n    labels: [label1]\n")
+
+        # When
+        jobs = load_jobs(path)
+
+        # Then
+        self.assertEqual([{"op": "add_labels", "epic": "PROJ001-001", "labels": ["label1"]}], jobs)
+
+
+class TestRunJobs(unittest.TestCase):
+    def setUp(self) -> None:
+        self.jira_client = Mock(spec=jira.JIRA)
+        self.jira_client.fields.return_value = DEFAULT_FIELDS_RETURN_VALUE
+        self.jat = JiraAgileToolBox(self.jira_client, max_workers=4)
+
+    def test_run_jobs_returns_the_results_in_the_order_of_the_jobs(self):
+        # Given
+        self.jira_client.search_issues.return_value = [MockedJiraIssue(1, "Closed")]
+        jobs = [{"id": "points", "op": "storypoints", "epic": "PROJ001-001"}, {"op": "add_labels", "epic": "PROJ001-002", "labels": "l1"}]
+
+        # When
+        results = run_jobs(self.jat, jobs)
+
+        # Then
+        self.assertEqual(
+            [
+                {"id": "points", "op": "storypoints", "status": "done", "result": {"total": 1, "Closed": 1}},
+                {"id": 1, "op": "add_labels", "status": "done", "result": None},
+            ],
+            results,
+        )
+
+    def test_run_jobs_looks_up_the_story_points_field_only_once(self):
+        # Given
+        self.jira_client.search_issues.return_value = [MockedJiraIssue(1)]
+        jobs = [{"op": "storypoints", "epic": f"PROJ001-{i:03}"} for i in range(20)]
+
+        # When
+        run_jobs(self.jat, jobs)
+
+        # Then
+        self.jira_client.fields.assert_called_once()
+
+    def test_independent_jobs_run_concurrently(self):
+        # Given
+        barrier = threading.Barrier(2, timeout=5)
+
+        def search_issues(*args, **kwargs):
+            barrier.wait()
+            return [MockedJiraIssue(1)]
+
+        self.jira_client.search_issues.side_effect = search_issues
+        jobs = [{"op": "storypoints", "epic": "PROJ001-001"}, {"op": "storypoints", "epic": "PROJ001-002"}]
+
+        # When
+        results = run_jobs(self.jat, jobs)
+
+        # Then
+        self.assertEqual(["done", "done"], [result["status"] for result in results])
+
+    def test_jobs_on_the_same_epic_run_in_the_order_of_the_file(self):
+        # Given
+        sub_story = MockedJiraIssue()
+        self.jira_client.search_issues.return_value = [sub_story]
+        jobs = [{"op": "add_labels", "epic": "PROJ001-001", "labels": f"label{i}"} for i in range(10)]
+
+        # When
+        run_jobs(self.jat, jobs)
+
+        # Then
+        self.assertEqual([call("labels", f"label{i}") for i in range(10)], sub_story.add_field_value.call_args_list)
+
+    def test_jobs_depending_on_a_failed_job_are_skipped(self):
+        # Given
+        self.jira_client.search_issues.side_effect = [jira.JIRAError("boom"), [MockedJiraIssue(1)]]
+        jobs = [
+            {"id": "labels", "op": "add_labels", "epic": "PROJ001-001", "labels": "l1"},
+            {"op": "storypoints", "epic": "PROJ001-002", "after": ["labels"]},
+            {"op": "storypoints", "epic": "PROJ001-003"},
+        ]
+
+        # When
+        results = run_jobs(self.jat, jobs)
+
+        # Then
+        self.assertEqual(["failed", "skipped", "done"], [result["status"] for result in results])
+        self.assertIn("boom", results[0]["error"])
+
+    def test_run_jobs_rejects_unknown_operations_and_missing_arguments(self):
+        self.assertRaisesRegex(ValueError, "unknown op", run_jobs, self.jat, [{"op": "delete_everything"}])
+        self.assertRaisesRegex(ValueError, "add_labels needs labels", run_jobs, self.jat, [{"op": "add_labels", "epic": "PROJ001-001"}])
+
+    def test_run_jobs_rejects_duplicate_ids_and_ids_colliding_with_the_index_of_another_job(self):
+        # Given
+        duplicate_ids = [
+            {"id": "a", "op": "storypoints", "epic": "PROJ001-001"},
+            {"id": "a", "op": "storypoints", "epic": "PROJ001-002"},
+        ]
+        colliding_ids = [
+            {"op": "storypoints", "epic": "PROJ001-001"},
+            {"id": 0, "op": "storypoints", "epic": "PROJ001-002"},
+        ]
+
+        # Then
+        self.assertRaisesRegex(ValueError, "job 1: id 'a' is used by another job", run_jobs, self.jat, duplicate_ids)
+        self.assertRaisesRegex(ValueError, "job 1: id 0 is used by another job", run_jobs, self.jat, colliding_ids)
+        self.jira_client.search_issues.assert_not_called()
+
+    def test_run_jobs_rejects_circular_dependencies(self):
+        # Given
+        jobs = [
+            {"id": "a", "op": "storypoints", "epic": "PROJ001-001", "after": ["b"]},
+            {"id": "b", "op": "storypoints", "epic": "PROJ001-002", "after": ["a"]},
+        ]
+
+        # Then
+        self.assertRaisesRegex(ValueError, "circular", run_jobs, self.jat, jobs)
+        self.jira_client.search_issues.assert_not_called()
+
+    def test_rank_jobs_rank_the_issues_by_their_keys(self):
+        # Given
+        issue1, issue2, issue5 = MockedJiraIssue(), MockedJiraIssue(), MockedJiraIssue()
+        issue1.key, issue2.key, issue5.key = "PROJ001-001", "PROJ001-002", "PROJ001-005"
+        self.jira_client.search_issues.return_value = [issue2, issue1]
+        self.jira_client.issue.return_value = issue5
+
+        # When
+        results = run_jobs(self.jat, [{"op": "rank", "issues": ["PROJ001-001", "PROJ001-002"], "on_top_of": "PROJ001-005"}])
+
+        # Then
+        self.assertEqual("done", results[0]["status"])
+        self.jira_client.search_issues.assert_called_with("key in (PROJ001-001,PROJ001-002)", fields="key", maxResults=0)
+        self.jira_client.rank.assert_has_calls([call("PROJ001-002", "PROJ001-005"), call("PROJ001-001", "PROJ001-002")])
@@ -0,0 +1,159 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, call
+
+import jira
+from lib_for_tests import MockedJiraIssue
+
+from jira_agile_toolbox import JiraAgileToolBox
+from jira_agile_toolbox.journal import Journal
+
+
+def _issue(key, **kwargs):
+    issue = MockedJiraIssue(**kwargs)
+    issue.key = key
+    return issue
+
+
+class TestJournal(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "bulk.journal")
+
+    def test_a_journal_remembers_done_keys_between_runs(self):
+        # Given
+        with Journal(self.path) as journal:
+            journal.mark_done("labels:PROJ001-001:label1", "PROJ001-002")
+
+        # When
+        journal = Journal(self.path)
+
+        # Then
+        self.assertTrue(journal.is_done("labels:PROJ001-001:label1", "PROJ001-002"))
+        self.assertFalse(journal.is_done("labels:PROJ001-001:label2", "PROJ001-002"))
+        self.assertFalse(journal.is_done("labels:PROJ001-001:label1", "PROJ001-003"))
+
+    def test_a_journal_writes_keys_in_batches(self):
+        # Given
+        journal = Journal(self.path, batch_size=3)
+
+        # When
+        journal.mark_done("scope", "PROJ001-001")
+        journal.mark_done("scope", "PROJ001-002")
+
+        # Then
+        self.assertFalse(os.path.exists(self.path))
+        journal.mark_done("scope", "PROJ001-003")
+        with open(self.path) as journal_file:
+            self.assertEqual(3, len(journal_file.readlines()))
+
+
+class TestResumableBulkOperations(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "bulk.journal")
+        self.jira_client = Mock(spec=jira.JIRA)
+        self.jat = JiraAgileToolBox(self.jira_client)
+
+    def test_a_rerun_of_label_propagation_skips_the_issues_already_labelled(self):
+        # Given
+        issues = [_issue(f"PROJ001-{i:03}") for i in range(2, 6)]
+        issues[2].add_field_value.side_effect = jira.JIRAError("token expired")
+        self.jira_client.search_issues.return_value = issues
+        with self.assertRaises(jira.JIRAError):
+            self.jat.add_labels_to_all_sub_items_of_epic("PROJ001-001", "label1", journal=Journal(self.path))
+        issues[2].add_field_value.side_effect = None
+
+        # When
+        self.jat.add_labels_to_all_sub_items_of_epic("PROJ001-001", "label1", journal=Journal(self.path))
+
+        # Then
+        self.assertEqual(1, issues[0].add_field_value.call_count)
+        self.assertEqual(1, issues[1].add_field_value.call_count)
+        self.assertEqual(2, issues[2].add_field_value.call_count)
+        self.assertEqual(1, issues[3].add_field_value.call_count)
+
+    def test_other_labels_are_not_skipped_by_the_journal(self):
+        # Given
+        issue = _issue("PROJ001-002")
+        self.jira_client.search_issues.return_value = [issue]
+        journal = Journal(self.path)
+        self.jat.add_labels_to_all_sub_items_of_epic("PROJ001-001", "label1", journal=journal)
+
+        # When
+        self.jat.add_labels_to_all_sub_items_of_epic("PROJ001-001", "label2", journal=journal)
+
+        # Then
+        issue.add_field_value.assert_has_calls([call("labels", "label1"), call("labels", "label2")])
+
+    def test_a_rerun_of_fix_version_propagation_skips_the_issues_already_updated(self):
+        # Given
+        version = Mock(spec=jira.resources.Version)
+        version.name = "JAT 0.0.9"
+        epic = _issue("PROJ001-001", fix_versions=[version])
+        issues = [_issue("PROJ001-002"), _issue("PROJ001-003")]
+        issues[1].update.side_effect = jira.JIRAError("network blip")
+        self.jira_client.search_issues.return_value = issues
+        with self.assertRaises(jira.JIRAError):
+            self.jat.copy_fix_version_from_epic_to_all_items_in_epic(epic, keep_already_present=False, journal=Journal(self.path))
+        issues[1].update.side_effect = None
+
+        # When
+        self.jat.copy_fix_version_from_epic_to_all_items_in_epic(epic, keep_already_present=False, journal=Journal(self.path))
+
+        # Then
+        issues[0].update.assert_called_once_with(fields={"fixVersions": [{"name": "JAT 0.0.9"}]})
+        self.assertEqual(2, issues[1].update.call_count)
+
+    def test_other_fix_versions_of_the_epic_are_not_skipped_by_the_journal(self):
+        # Given
+        version = Mock(spec=jira.resources.Version)
+        version.name = "JAT 0.0.9"
+        epic = _issue("PROJ001-001", fix_versions=[version])
+        issue = _issue("PROJ001-002")
+        self.jira_client.search_issues.return_value = [issue]
+        journal = Journal(self.path)
+        self.jat.copy_fix_version_from_epic_to_all_items_in_epic(epic, journal=journal)
+
+        # When
+        version.name = "JAT 0.1.0"
+        self.jat.copy_fix_version_from_epic_to_all_items_in_epic(epic, journal=journal)
+        self.jat.copy_fix_version_from_epic_to_all_items_in_epic(epic, keep_already_present=False, journal=journal)
+
+        # Then
+        issue.add_field_value.assert_has_calls([call("fixVersions", {"name": "JAT 0.0.9"}), call("fixVersions", {"name": "JAT 0.1.0"})])
+        issue.update.assert_called_once_with(fields={"fixVersions": [{"name": "JAT 0.1.0"}]})
+
+    def test_a_rerun_of_ranking_continues_from_the_last_ranked_issue(self):
+        # Given
+        ranked_list = [_issue("PsY-001"), _issue("PsY-002"), _issue("PsY-003")]
+        on_top_of = _issue("PsY-004")
+        self.jira_client.rank.side_effect = [None, jira.JIRAError("network blip")]
+        with self.assertRaises(jira.JIRAError):
+            self.jat.rank_issues_by_list(ranked_list, on_top_of, journal=Journal(self.path))
+        self.jira_client.rank.reset_mock(side_effect=True)
+
+        # When
+        self.jat.rank_issues_by_list(ranked_list, on_top_of, journal=Journal(self.path))
+
+        # Then
+        self.jira_client.rank.assert_has_calls([call("PsY-002", "PsY-003"), call("PsY-001", "PsY-002")])
+        self.assertEqual(2, self.jira_client.rank.call_count)
+
+    def test_another_ranking_on_top_of_the_same_issue_is_not_skipped_by_the_journal(self):
+        # Given
+        ranked_list = [_issue("PsY-001"), _issue("PsY-002")]
+        on_top_of = _issue("PsY-004")
+        journal = Journal(self.path)
+        self.jat.rank_issues_by_list(ranked_list, on_top_of, journal=journal)
+        self.jira_client.rank.reset_mock()
+
+        # When
+        self.jat.rank_issues_by_list(ranked_list[::-1], on_top_of, journal=journal)
+
+        # Then
+        self.jira_client.rank.assert_has_calls([call("PsY-001", "PsY-004"), call("PsY-002", "PsY-001")])
+        self.assertEqual(2, self.jira_client.rank.call_count)
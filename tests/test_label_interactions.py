@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, call
 
 import jira
 from lib_for_tests import DEFAULT_FIELDS_RETURN_VALUE, MockedJiraIssue
@@ -118,5 +118,80 @@ def test_setting_a_label_for_all_sub_items_will_remove_already_present_labels_si
         sub_story.update.assert_called_with(fields={"labels": ["label_to_set"]})
 
 
+class TestLabelSettingForSubItemsOfMultipleEpics(unittest.TestCase):
+    def setUp(self) -> None:
+        self.jira_client = Mock(spec=jira.JIRA)
+
+    @staticmethod
+    def _sub_story(key):
+        sub_story = MockedJiraIssue()
+        sub_story.key = key
+        return sub_story
+
+    def test_setting_labels_for_multiple_epics_searches_all_epics_at_once(self):
+        # Given
+        self.jira_client.search_issues.return_value = [self._sub_story("PROJ001-002")]
+        jat = JiraAgileToolBox(self.jira_client)
+
+        # When
+        jat.add_labels_to_all_sub_items_of_epics(["PROJ001-001", "PROJ001-010"], ["label_to_set"])
+
+        # Then
+        self.jira_client.search_issues.assert_called_once_with("'parentEpic' in (PROJ001-001,PROJ001-010)", fields=["labels"], maxResults=0)
+
+    def test_setting_labels_for_multiple_epics_searches_in_chunks_of_50_epics(self):
+        # Given
+        self.jira_client.search_issues.return_value = []
+        jat = JiraAgileToolBox(self.jira_client)
+        epics = [f"PROJ001-{i:03}" for i in range(60)]
+
+        # When
+        jat.add_labels_to_all_sub_items_of_epics(epics, "label_to_set", jql_query="status != Closed")
+
+        # Then
+        self.jira_client.search_issues.assert_has_calls(
+            [
+                call(f"'parentEpic' in ({','.join(epics[:50])}) AND status != Closed", fields=["labels"], maxResults=0),
+                call(f"'parentEpic' in ({','.join(epics[50:])}) AND status != Closed", fields=["labels"], maxResults=0),
+            ]
+        )
+
+    def test_setting_labels_for_multiple_epics_updates_every_issue_once_with_all_labels(self):
+        # Given
+        sub_story = self._sub_story("PROJ001-002")
+        self.jira_client.search_issues.side_effect = [[sub_story], [self._sub_story("PROJ001-002")]]
+        jat = JiraAgileToolBox(self.jira_client)
+        epics = [f"PROJ001-{i:03}" for i in range(60)]
+
+        # When
+        jat.add_labels_to_all_sub_items_of_epics(epics, ["label_to_set", "label2"])
+
+        # Then
+        sub_story.update.assert_called_once_with(update={"labels": [{"add": "label_to_set"}, {"add": "label2"}]})
+        sub_story.add_field_value.assert_not_called()
+
+    def test_setting_labels_for_multiple_epics_can_remove_already_present_labels(self):
+        # Given
+        sub_story = self._sub_story("PROJ001-002")
+        self.jira_client.search_issues.return_value = [sub_story]
+        jat = JiraAgileToolBox(self.jira_client)
+
+        # When
+        jat.add_labels_to_all_sub_items_of_epics(["PROJ001-001"], "label_to_set", keep_already_present=False)
+
+        # Then
+        sub_story.update.assert_called_once_with(fields={"labels": ["label_to_set"]})
+
+    def test_setting_labels_for_multiple_epics_raises_an_exception_on_a_label_with_a_space(self):
+        # Given
+        jat = JiraAgileToolBox(self.jira_client)
+
+        # Then
+        self.assertRaisesRegex(
+            ValueError, "no spaces are allowed in labels", jat.add_labels_to_all_sub_items_of_epics, ["PROJ001-001"], ["label_to set"]
+        )
+        self.jira_client.search_issues.assert_not_called()
+
+
 if __name__ == "__main__":
     unittest.main()
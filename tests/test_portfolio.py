@@ -0,0 +1,85 @@
+import json
+import unittest
+from unittest.mock import Mock
+
+import jira
+from lib_for_tests import DEFAULT_FIELDS_RETURN_VALUE
+
+from jira_agile_toolbox import JiraAgileToolBox
+
+STORY_POINTS_FIELD = "customfield_10282"
+
+
+def _raw_issue(story_points, status):
+    return {"key": "JAT-999", "fields": {"status": {"name": status}, STORY_POINTS_FIELD: story_points}}
+
+
+class TestStorypointsFromEpics(unittest.TestCase):
+    def setUp(self) -> None:
+        self.jira_client = Mock(spec=jira.JIRA)
+        self.jira_client.fields.return_value = DEFAULT_FIELDS_RETURN_VALUE
+        self.jira_client._get_url.return_value = "https://jira.example.com/rest/api/2/search"
+        self.jira_client._session = Mock()
+        self.jat = JiraAgileToolBox(self.jira_client)
+        self.issues_per_search = {}
+        self.jira_client.search_issues.side_effect = lambda jql, **kwargs: {"total": len(self.issues_per_search[jql])}
+        self.jira_client._session.get.side_effect = self._get_page
+
+    def _get_page(self, url, params):
+        issues = self.issues_per_search[params["jql"]]
+        page = issues[params["startAt"] : params["startAt"] + params["maxResults"]]
+        return Mock(content=json.dumps({"startAt": params["startAt"], "total": len(issues), "issues": page}).encode())
+
+    def test_story_points_are_summed_per_epic_and_status_over_all_pages(self):
+        # Given
+        self.issues_per_search["'parentEpic' = JAT-001 ORDER BY key ASC"] = [
+            _raw_issue(3.0, "Reported"),
+            _raw_issue(None, "In Progress"),
+            _raw_issue(5, "Closed"),
+            _raw_issue(2, "Reported"),
+        ]
+        self.issues_per_search["'parentEpic' = JAT-002 ORDER BY key ASC"] = [_raw_issue(8, "Closed")]
+
+        # When
+        result = self.jat.get_storypoints_from_epics(["JAT-001", "JAT-002"], processes=2, page_size=3)
+
+        # Then
+        self.assertEqual(
+            {
+                "JAT-001": {"Reported": 5, "In Progress": 0, "Closed": 5, "total": 10},
+                "JAT-002": {"Closed": 8, "total": 8},
+            },
+            result,
+        )
+        self.assertEqual(3, self.jira_client._session.get.call_count)
+        self.assertEqual(
+            {"jql": "'parentEpic' = JAT-002 ORDER BY key ASC", "startAt": 0, "maxResults": 3, "fields": f"{STORY_POINTS_FIELD},status"},
+            self.jira_client._session.get.call_args_list[-1][1]["params"],
+        )
+
+    def test_the_results_match_get_storypoints_from_epic(self):
+        # Given
+        issues = [_raw_issue(1, "Reported"), _raw_issue(2, "Closed"), _raw_issue(None, "Closed")]
+        self.issues_per_search["'parentEpic' = JAT-001 AND status != Done ORDER BY key ASC"] = issues
+        mocked_issues = [Mock(fields=Mock(status=Mock(), **{STORY_POINTS_FIELD: issue["fields"][STORY_POINTS_FIELD]})) for issue in issues]
+        for mocked_issue, issue in zip(mocked_issues, issues):
+            mocked_issue.fields.status.name = issue["fields"]["status"]["name"]
+        self.jat.get_all_issues_in_epic = Mock(return_value=mocked_issues)
+
+        # When
+        result = self.jat.get_storypoints_from_epics(["JAT-001"], jql_query="status != Done", processes=1)
+
+        # Then
+        self.assertEqual({"JAT-001": self.jat.get_storypoints_from_epic("JAT-001", jql_query="status != Done")}, result)
+
+    def test_issues_added_while_the_epic_is_read_are_fetched_as_well(self):
+        # Given
+        self.issues_per_search["'parentEpic' = JAT-001 ORDER BY key ASC"] = [_raw_issue(1, "Reported")] * 5
+        self.jira_client.search_issues.side_effect = lambda jql, **kwargs: {"total": 2}
+
+        # When
+        result = self.jat.get_storypoints_from_epics(["JAT-001"], processes=1, page_size=2)
+
+        # Then
+        self.assertEqual({"JAT-001": {"Reported": 5, "total": 5}}, result)
+        self.assertEqual([0, 2, 4], sorted(get_call[1]["params"]["startAt"] for get_call in self.jira_client._session.get.call_args_list))
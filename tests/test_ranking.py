@@ -4,6 +4,7 @@
 import jira
 
 from jira_agile_toolbox import JiraAgileToolBox
+from jira_agile_toolbox.rank_index import rank_between
 
 mocked_issue_1 = Mock(spec=jira.Issue)
 mocked_issue_1.key = "PsY-001"
@@ -79,3 +80,92 @@ def test_ranking_at_the_top_of_the_backlog_searches_for_the_highest_ranked_issue
                 call(mocked_issue_1.key, mocked_issue_2.key),
             ]
         )
+
+
+def _backlog_page(keys_and_ranks, start_at, total):
+    return {
+        "startAt": start_at,
+        "maxResults": 100,
+        "total": total,
+        "issues": [{"key": key, "fields": {"customfield_10010": rank}} for key, rank in keys_and_ranks],
+    }
+
+
+RANK_FIELD = {"id": "customfield_10010", "name": "Rank", "schema": {"custom": "com.pyxis.greenhopper.jira:gh-lexo-rank", "customId": 10010}}
+BACKLOG = [("PsY-010", "0|hzzzzz:"), ("PsY-005", "0|i00007:"), ("PsY-003", "0|i0000f:"), ("PsY-002", "0|i0000n:"), ("PsY-001", "0|i0000v:")]
+
+
+class TestBacklogRankIndex(TestCase):
+    def setUp(self) -> None:
+        self.jira_client = Mock(spec=jira.JIRA)
+        self.jira_client.fields.return_value = [RANK_FIELD]
+        self.jira_client.search_issues.side_effect = [_backlog_page(BACKLOG[:3], 0, 5), _backlog_page(BACKLOG[3:], 3, 5)]
+        self.jat = JiraAgileToolBox(self.jira_client)
+
+    def test_the_backlog_is_paged_through_once(self):
+        # When
+        backlog = self.jat.get_backlog_rank_index("PsY")
+        self.jat.get_backlog_rank_index("PsY")
+
+        # Then
+        self.assertEqual([key for key, _ in BACKLOG], backlog.keys())
+        self.jira_client.search_issues.assert_has_calls(
+            [
+                call("project = PsY ORDER BY Rank ASC", startAt=0, maxResults=100, fields=["customfield_10010"], json_result=True),
+                call("project = PsY ORDER BY Rank ASC", startAt=3, maxResults=100, fields=["customfield_10010"], json_result=True),
+            ]
+        )
+        self.assertEqual(2, self.jira_client.search_issues.call_count)
+
+    def test_the_index_answers_positions_and_relative_order(self):
+        # When
+        backlog = self.jat.get_backlog_rank_index("PsY")
+
+        # Then
+        self.assertEqual(0, backlog.position("PsY-010"))
+        self.assertEqual(3, backlog.position("PsY-002"))
+        self.assertEqual("PsY-003", backlog.key_at(2))
+        self.assertTrue(backlog.is_ranked_before("PsY-005", "PsY-001"))
+        self.assertTrue(backlog.is_ordered(["PsY-010", "PsY-003", "PsY-001"]))
+        self.assertFalse(backlog.is_ordered(["PsY-003", "PsY-010"]))
+        self.assertNotIn("PsY-999", backlog)
+
+    def test_ranking_through_the_toolbox_updates_the_index(self):
+        # Given
+        backlog = self.jat.get_backlog_rank_index("PsY")
+
+        # When
+        self.jat.rank_issues_by_list([mocked_issue_1, mocked_issue_2], mocked_issue_3)
+
+        # Then
+        self.assertEqual(["PsY-010", "PsY-005", "PsY-001", "PsY-002", "PsY-003"], backlog.keys())
+        self.assertEqual(2, backlog.position("PsY-001"))
+        self.assertTrue(backlog.is_ordered(backlog.keys()))
+
+    def test_ranking_at_the_top_of_the_project_uses_the_index_instead_of_searching(self):
+        # Given
+        backlog = self.jat.get_backlog_rank_index("PsY")
+
+        # When
+        self.jat.rank_issues_at_top_of_project([mocked_issue_1, mocked_issue_3], "PsY")
+
+        # Then
+        self.assertEqual(2, self.jira_client.search_issues.call_count)
+        self.jira_client.rank.assert_has_calls([call(mocked_issue_3.key, "PsY-010"), call(mocked_issue_1.key, mocked_issue_3.key)])
+        self.assertEqual(["PsY-001", "PsY-003", "PsY-010", "PsY-005", "PsY-002"], backlog.keys())
+
+
+class TestRankBetween(TestCase):
+    def test_rank_between_sorts_between_its_neighbours(self):
+        ranks = [None, "0|hzzzzz:", "0|i00007:", "0|i00007:0", "0|i00008:", "a", "a!0", "b", "~~", None]
+        for lower, upper in zip(ranks, ranks[1:]):
+            rank = rank_between(lower, upper)
+            self.assertTrue(lower is None or lower < rank, (lower, rank))
+            self.assertTrue(upper is None or rank < upper, (rank, upper))
+
+    def test_repeatedly_inserting_at_the_same_place_keeps_the_order(self):
+        lower, upper = "0|i00007:", "0|i00008:"
+        for _ in range(200):
+            rank = rank_between(lower, upper)
+            self.assertTrue(lower < rank < upper)
+            upper = rank
@@ -0,0 +1,512 @@
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+import unittest
+from urllib.parse import parse_qs, urlsplit
+
+import jira
+import requests
+from lib_for_tests import DEFAULT_FIELDS_RETURN_VALUE, LocalJsonServer
+
+from jira_agile_toolbox import JiraAgileToolBox
+from jira_agile_toolbox.replay import REDACTED, REPLAY_SERVER, ReplayAdapter, profile, record, replay_client
+
+CASSETTES = os.path.join(os.path.dirname(__file__), "cassettes")
+ISSUES_IN_EPIC = 120
+STATUSES = [
+    ("Reported", "1", 2, "new", "To Do"),
+    ("In Progress", "3", 4, "indeterminate", "In Progress"),
+    ("Closed", "6", 3, "done", "Done"),
+]
+USERS = [None, ("jneefs", "Jef Neefs"), ("apeeters", "Ann Peeters")]
+VERSIONS = [("31063", "0.0.10"), ("31064", "0.0.11")]
+# epic key: (the numbers of its issues, the names of its fixVersions), together they make up the backlog of project JAT
+EPICS = {
+    "JAT-001": (range(2, ISSUES_IN_EPIC + 2), []),
+    "JAT-200": (range(201, 205), ["0.0.10"]),
+    "JAT-300": ([204, 301, 302], ["0.0.11"]),
+}
+SPRINT = (
+    "com.atlassian.greenhopper.service.sprint.Sprint@5c0a7e[id=31,rapidViewId=1,state=ACTIVE,name=Sprint 1,"
+    "startDate=2021-03-01T09:00:00.000+01:00,endDate=2021-03-15T09:00:00.000+01:00,completeDate=<null>,sequence=31]"
+)
+FIELDS = DEFAULT_FIELDS_RETURN_VALUE + [
+    {
+        "id": "customfield_10020",
+        "name": "Sprint",
+        "custom": True,
+        "orderable": True,
+        "navigable": True,
+        "searchable": True,
+        "clauseNames": ["cf[10020]", "Sprint"],
+        "schema": {"type": "array", "items": "string", "custom": "com.pyxis.greenhopper.jira:gh-sprint", "customId": 10020},
+    },
+    {
+        "id": "customfield_10019",
+        "name": "Rank",
+        "custom": True,
+        "orderable": True,
+        "navigable": True,
+        "searchable": True,
+        "clauseNames": ["cf[10019]", "Rank"],
+        "schema": {"type": "any", "custom": "com.pyxis.greenhopper.jira:gh-lexo-rank", "customId": 10019},
+    },
+]
+REDACT_SERVER = r"127\.0\.0\.1:\d+"
+
+
+def _status(number, server):
+    name, status_id, category_id, category_key, category_name = STATUSES[number % len(STATUSES)]
+    return {
+        "self": f"{server}/rest/api/2/status/{status_id}",
+        "description": f"issues which are {name.lower()}",
+        "iconUrl": f"{server}/images/icons/statuses/generic.png",
+        "name": name,
+        "id": status_id,
+        "statusCategory": {
+            "self": f"{server}/rest/api/2/statuscategory/{category_id}",
+            "id": category_id,
+            "key": category_key,
+            "colorName": "blue-gray",
+            "name": category_name,
+        },
+    }
+
+
+class JiraLikeServer:
+    """
+    a local server which answers the requests of the toolbox with payloads shaped like the ones of jira 8, it holds the
+    issues of EPICS in project JAT and accepts every update without changing them
+    """
+
+    def __init__(self):
+        self.url = None
+        self._children = {epic_key: [f"JAT-{number:03d}" for number in numbers] for epic_key, (numbers, _) in EPICS.items()}
+        self._backlog = list(dict.fromkeys(key for keys in self._children.values() for key in keys))
+
+    def __enter__(self):
+        self._server = LocalJsonServer(self).__enter__()
+        # issues link to the server they come from, just like on a real jira server
+        self.url = self._server.url
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.__exit__(*exc_info)
+
+    def __call__(self, method, path, body):
+        parts = urlsplit(path)
+        query = parse_qs(parts.query)
+        route = parts.path.split("/")[3:]
+        if method == "GET" and route == ["2", "field"]:
+            return self._json(FIELDS)
+        if method == "GET" and route == ["2", "search"]:
+            return self._json(self._search(query))
+        if method == "GET" and route[:2] == ["2", "issue"]:
+            return self._json(self._issue(self._key(route[2]), self._fields(query)))
+        if method == "GET" and route[:2] == ["2", "project"] and route[3] == "versions":
+            return self._json([self._version(version_id, name) for version_id, name in VERSIONS])
+        if method == "GET" and route[:2] == ["2", "project"] and route[3] == "statuses":
+            statuses = [_status(number, self.url) for number in range(len(STATUSES))]
+            return self._json(
+                [{"self": f"{self.url}/rest/api/2/issuetype/10001", "id": "10001", "name": "Story", "subtask": False, "statuses": statuses}]
+            )
+        if method in ("PUT", "POST") and (route[:2] in (["2", "issue"], ["1.0", "sprint"]) or route == ["1.0", "issue", "rank"]):
+            return None
+        raise ValueError(f"a jira like server does not know {method} {path}")
+
+    @staticmethod
+    def _json(payload):
+        return json.dumps(payload).encode()
+
+    @staticmethod
+    def _key(key_or_id):
+        return f"JAT-{int(key_or_id) - 10000:03d}" if key_or_id.isdigit() else key_or_id
+
+    @staticmethod
+    def _fields(query):
+        return [field for value in query.get("fields", []) for field in value.split(",")]
+
+    def _version(self, version_id, name):
+        return {"self": f"{self.url}/rest/api/2/version/{version_id}", "id": version_id, "name": name, "archived": False, "released": False}
+
+    def _all_fields(self, key):
+        number = int(key.split("-")[1])
+        user = USERS[number % len(USERS)]
+        version_names = EPICS[key][1] if key in EPICS else []
+        return {
+            "summary": f"issue number {number}",
+            "issuetype": {"self": f"{self.url}/rest/api/2/issuetype/10001", "id": "10001", "name": "Epic" if key in EPICS else "Story"},
+            "status": _status(number, self.url),
+            "assignee": (
+                {"self": f"{self.url}/rest/api/2/user?username={user[0]}", "name": user[0], "displayName": user[1]} if user else None
+            ),
+            "components": [{"self": f"{self.url}/rest/api/2/component/10100", "id": "10100", "name": "backend"}] if number % 2 else [],
+            "labels": ["release_train_1"] if number % 6 == 0 else [],
+            "fixVersions": [self._version(version_id, name) for version_id, name in VERSIONS if name in version_names],
+            "project": {"self": f"{self.url}/rest/api/2/project/10000", "id": "10000", "key": "JAT", "name": "Jira Agile Toolbox"},
+            "customfield_10282": float(number % 8) or None,
+            "customfield_10020": [SPRINT] if number % 5 == 0 else None,
+            "customfield_10019": f"0|i{number * 7 % 1000:04d}:",
+        }
+
+    def _issue(self, key, fields):
+        all_fields = self._all_fields(key)
+        issue_id = str(10000 + int(key.split("-")[1]))
+        return {
+            "expand": "operations,versionedRepresentations,editmeta,changelog,renderedFields",
+            "id": issue_id,
+            "self": f"{self.url}/rest/api/2/issue/{issue_id}",
+            "key": key,
+            "fields": {name: value for name, value in all_fields.items() if not fields or name in fields},
+        }
+
+    def _find(self, jql):
+        epics = re.search(r"'parentEpic' (?:=|in) \(?([\w,-]+)", jql)
+        keys_in = re.search(r"key in \(([\w,-]+)\)", jql)
+        if epics:
+            keys = list(dict.fromkeys(key for epic_key in epics.group(1).split(",") for key in self._children.get(epic_key, [])))
+        elif keys_in:
+            keys = [key for key in keys_in.group(1).split(",") if key in EPICS or key in self._backlog]
+        else:
+            keys = list(self._backlog)
+        status = re.search(r'status = "([^"]+)"', jql)
+        if status:
+            keys = [key for key in keys if self._all_fields(key)["status"]["name"] == status.group(1)]
+        if "statusCategory != Done" in jql:
+            keys = [key for key in keys if self._all_fields(key)["status"]["statusCategory"]["key"] != "done"]
+        if "sprint is EMPTY" in jql:
+            keys = [key for key in keys if not self._all_fields(key)["customfield_10020"]]
+        if "ORDER BY Rank ASC" in jql:
+            return sorted(keys, key=lambda key: self._all_fields(key)["customfield_10019"])
+        return sorted(keys)
+
+    def _search(self, query):
+        keys = self._find(query["jql"][0])
+        start_at = int(query.get("startAt", ["0"])[0])
+        max_results = min(int(query.get("maxResults", ["50"])[0]) or 50, 50)
+        issues = [self._issue(key, self._fields(query)) for key in keys[start_at : start_at + max_results]]
+        return {"expand": "schema,names", "startAt": start_at, "maxResults": max_results, "total": len(keys), "issues": issues}
+
+
+def _warmed_up(jat, call):
+    # the jira client loads its field names on the first search, searches which run concurrently would race to load them
+    jat.count_issues_in_epic("JAT-200")
+    return call
+
+
+def _rank_issues_by_list(jat):
+    issues = jat.get_all_issues_in_epic("JAT-200", fields=["key"])
+    return jat.rank_issues_by_list, (issues[:0:-1], issues[0]), {}
+
+
+def _rank_issues_at_top_of_project(jat):
+    return jat.rank_issues_at_top_of_project, (jat.get_all_issues_in_epic("JAT-300", fields=["key"]), "JAT"), {}
+
+
+# cassette name: a function which prepares a replayed or recorded toolbox and returns the call to profile with its arguments
+BASELINES = {
+    "storypoints_of_epics": lambda jat: _warmed_up(
+        jat, (jat.get_storypoints_from_epics, (["JAT-001", "JAT-200"],), {"processes": 1, "page_size": 50})
+    ),
+    "aggregations_from_epic": lambda jat: (
+        jat.get_aggregations_from_epic,
+        ("JAT-001", ["status", "assignee", ("issuetype", "sprint"), "component"]),
+        {"metrics": ["Story Points"]},
+    ),
+    "count_issues_in_epic": lambda jat: (jat.count_issues_in_epic, ("JAT-001",), {"jql_query": "statusCategory != Done"}),
+    "count_issues_in_epic_by_status": lambda jat: _warmed_up(jat, (jat.count_issues_in_epic_by_status, ("JAT-001",), {})),
+    "all_issues_in_epics": lambda jat: (jat.get_all_issues_in_epics, (["JAT-200", "JAT-300"],), {"fields": ["status"]}),
+    "rank_issues_by_list": _rank_issues_by_list,
+    "rank_issues_at_top_of_project": _rank_issues_at_top_of_project,
+    "backlog_rank_index": lambda jat: (jat.get_backlog_rank_index, ("JAT",), {}),
+    "plan_sprints": lambda jat: (jat.plan_sprints, ("JAT", [10, 10]), {"sprint_ids": [31, 32]}),
+    "export_epic": lambda jat: (
+        jat.export_epic,
+        ("JAT-001", io.StringIO()),
+        {"format": "csv", "fields": ["summary", "status"], "page_size": 50},
+    ),
+    "labels_of_epic": lambda jat: (jat.add_labels_to_all_sub_items_of_epic, ("JAT-200", "release_train_2"), {}),
+    "labels_of_epics": lambda jat: (jat.add_labels_to_all_sub_items_of_epics, (["JAT-200", "JAT-300"], "release_train_2"), {}),
+    "fix_version_of_epic": lambda jat: (jat.copy_fix_version_from_epic_to_all_items_in_epic, ("JAT-200",), {}),
+    "fix_versions_of_epics": lambda jat: (jat.copy_fix_version_from_epics_to_all_items_in_epics, (["JAT-200", "JAT-300"],), {}),
+}
+
+
+def record_baselines(names=None):
+    """records the cassettes of the baselines again, run this module after a change to the requests the toolbox sends"""
+    for name in names or BASELINES:
+        with JiraLikeServer() as server:
+            jat = JiraAgileToolBox(jira.JIRA(server.url, get_server_info=False, basic_auth=("jneefs", "secret")))
+            with record(jat._jira_client._session, os.path.join(CASSETTES, f"{name}.json"), redact=[REDACT_SERVER]):
+                function, args, kwargs = BASELINES[name](jat)
+                function(*args, **kwargs)
+
+
+class TestRecordAndReplay(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cassette = os.path.join(tempfile.mkdtemp(), "cassette.json")
+
+    def test_a_recorded_session_replays_the_same_results_without_a_server(self):
+        # Given
+        with JiraLikeServer() as server:
+            jat = JiraAgileToolBox(jira.JIRA(server.url, get_server_info=False, basic_auth=("jneefs", "secret")))
+            with record(jat._jira_client._session, self.cassette):
+                recorded = jat.get_storypoints_from_epic("JAT-001")
+
+        # When
+        replayed = JiraAgileToolBox(replay_client(self.cassette, timing=False)).get_storypoints_from_epic("JAT-001")
+
+        # Then
+        self.assertEqual(recorded, replayed)
+
+    def test_credentials_and_redacted_patterns_are_not_recorded(self):
+        # Given
+        with JiraLikeServer() as server:
+            jat = JiraAgileToolBox(jira.JIRA(server.url, get_server_info=False, basic_auth=("jneefs", "secret")))
+
+            # When
+            with record(jat._jira_client._session, self.cassette, redact=[REDACT_SERVER]):
+                jat.get_all_issues_in_epic("JAT-001", fields=["status"])
+
+        # Then
+        with open(self.cassette, encoding="utf-8") as cassette:
+            recorded = cassette.read()
+        self.assertNotIn("Authorization", recorded)
+        self.assertNotIn("127.0.0.1", recorded)
+        self.assertIn(REDACTED, recorded)
+
+    def test_a_session_recorded_with_redacted_patterns_replays_with_the_same_patterns(self):
+        # Given
+        with JiraLikeServer() as server:
+            jat = JiraAgileToolBox(jira.JIRA(server.url, get_server_info=False, basic_auth=("jneefs", "secret")))
+            with record(jat._jira_client._session, self.cassette, redact=[r"JAT-\d+"]):
+                recorded = jat.get_storypoints_from_epic("JAT-001")
+
+        # When
+        replayed = JiraAgileToolBox(replay_client(self.cassette, timing=False, redact=[r"JAT-\d+"])).get_storypoints_from_epic("JAT-001")
+
+        # Then
+        self.assertEqual(recorded, replayed)
+
+    def test_recording_restores_the_adapters_of_the_session(self):
+        # Given
+        session = requests.Session()
+        adapter = session.get_adapter("https://jira.example.com")
+
+        # When
+        with record(session, self.cassette):
+            pass
+
+        # Then
+        self.assertIs(adapter, session.get_adapter("https://jira.example.com"))
+
+    def test_replaying_waits_as_long_as_the_recorded_responses_took(self):
+        # Given
+        with open(self.cassette, "w", encoding="utf-8") as cassette:
+            json.dump(
+                {
+                    "interactions": [
+                        {
+                            "request": {"method": "GET", "url": "https://jira.example.com/rest/api/2/field", "headers": {}, "body": ""},
+                            "response": {"status": 200, "reason": "OK", "headers": {}, "body": "[]"},
+                            "elapsed": 0.2,
+                        }
+                    ]
+                },
+                cassette,
+            )
+        session = requests.Session()
+        session.mount("https://", ReplayAdapter(self.cassette, speed=2))
+
+        # When
+        response = session.get("https://jira.example.com/rest/api/2/field")
+
+        # Then
+        self.assertEqual([], response.json())
+        self.assertGreaterEqual(response.elapsed.total_seconds(), 0.1)
+
+    def test_requests_which_were_not_recorded_are_refused(self):
+        # Given
+        with open(self.cassette, "w", encoding="utf-8") as cassette:
+            json.dump({"interactions": []}, cassette)
+        session = requests.Session()
+        session.mount("https://", ReplayAdapter(self.cassette))
+
+        # When / Then
+        with self.assertRaises(ValueError):
+            session.get("https://jira.example.com/rest/api/2/field")
+
+
+class TestRecordedTrafficRegressions(unittest.TestCase):
+    """profiles toolbox methods against a recorded session of an epic with 120 issues spread over 3 search pages"""
+
+    MAX_CPU_TIME = 0.5
+    MAX_PEAK_MEMORY = 1024 * 1024
+
+    def setUp(self) -> None:
+        self.jat = JiraAgileToolBox(replay_client(os.path.join(CASSETTES, "storypoints_of_epic.json"), timing=False))
+
+    def test_story_points_of_an_epic(self):
+        # When
+        measured = profile(self.jat, self.jat.get_storypoints_from_epic, "JAT-001")
+
+        # Then
+        self.assertEqual({"Closed": 140, "In Progress": 140, "Reported": 140, "total": 420}, measured["result"])
+        self.assertEqual(5, measured["requests"])
+        self.assertLess(measured["cpu_time"], self.MAX_CPU_TIME)
+        self.assertLess(measured["peak_memory"], self.MAX_PEAK_MEMORY)
+
+    def test_all_issues_in_an_epic(self):
+        # Given
+        self.jat.get_storypoints_from_epic("JAT-001")
+
+        # When
+        measured = profile(self.jat, self.jat.get_all_issues_in_epic, "JAT-001", fields=["status"])
+
+        # Then
+        self.assertEqual(120, len(measured["result"]))
+        self.assertEqual(3, measured["requests"])
+        self.assertLess(measured["cpu_time"], self.MAX_CPU_TIME)
+        self.assertLess(measured["peak_memory"], self.MAX_PEAK_MEMORY)
+
+
+class TestBaselineRegressions(unittest.TestCase):
+    """profiles every public toolbox method against its cassette in BASELINES, all recorded requests have to be sent again"""
+
+    MAX_CPU_TIME = 0.5
+    MAX_PEAK_MEMORY = 2 * 1024 * 1024
+
+    def _profile(self, name):
+        jat = JiraAgileToolBox(replay_client(os.path.join(CASSETTES, f"{name}.json"), timing=False))
+        function, args, kwargs = BASELINES[name](jat)
+        measured = profile(jat, function, *args, **kwargs)
+        self.assertEqual(0, jat._jira_client._session.get_adapter(REPLAY_SERVER).unused())
+        self.assertLess(measured["cpu_time"], self.MAX_CPU_TIME)
+        self.assertLess(measured["peak_memory"], self.MAX_PEAK_MEMORY)
+        return measured
+
+    def test_story_points_of_several_epics(self):
+        # When
+        measured = self._profile("storypoints_of_epics")
+
+        # Then
+        self.assertEqual(
+            {
+                "JAT-001": {"Reported": 140, "In Progress": 140, "Closed": 140, "total": 420},
+                "JAT-200": {"Reported": 5, "In Progress": 2, "Closed": 3, "total": 10},
+            },
+            measured["result"],
+        )
+        self.assertEqual(7, measured["requests"])
+
+    def test_aggregations_from_an_epic(self):
+        # When
+        measured = self._profile("aggregations_from_epic")
+
+        # Then
+        self.assertEqual({"count": 120, "Story Points": 420}, measured["result"]["total"])
+        self.assertEqual(
+            {("Story", None): {"count": 96, "Story Points": 336}, ("Story", "Sprint 1"): {"count": 24, "Story Points": 84}},
+            measured["result"][("issuetype", "sprint")],
+        )
+        self.assertEqual({"Ann Peeters", "Jef Neefs", None}, set(measured["result"]["assignee"]))
+        self.assertEqual(5, measured["requests"])
+
+    def test_count_issues_in_an_epic(self):
+        # When
+        measured = self._profile("count_issues_in_epic")
+
+        # Then
+        self.assertEqual(80, measured["result"])
+        self.assertEqual(2, measured["requests"])
+
+    def test_count_issues_in_an_epic_by_status(self):
+        # When
+        measured = self._profile("count_issues_in_epic_by_status")
+
+        # Then
+        self.assertEqual({"Reported": 40, "In Progress": 40, "Closed": 40, "total": 120}, measured["result"])
+        self.assertEqual(5, measured["requests"])
+
+    def test_all_issues_in_several_epics(self):
+        # When
+        measured = self._profile("all_issues_in_epics")
+
+        # Then
+        self.assertEqual(["JAT-201", "JAT-202", "JAT-203", "JAT-204", "JAT-301", "JAT-302"], [issue.key for issue in measured["result"]])
+        self.assertEqual(2, measured["requests"])
+
+    def test_rank_issues_by_list(self):
+        # When
+        measured = self._profile("rank_issues_by_list")
+
+        # Then
+        self.assertEqual(4, measured["requests"])
+
+    def test_rank_issues_at_top_of_project(self):
+        # When
+        measured = self._profile("rank_issues_at_top_of_project")
+
+        # Then
+        self.assertEqual(5, measured["requests"])
+
+    def test_backlog_rank_index(self):
+        # When
+        measured = self._profile("backlog_rank_index")
+
+        # Then
+        self.assertEqual(126, len(measured["result"]))
+        self.assertEqual("JAT-002", measured["result"].top())
+        self.assertEqual(5, measured["requests"])
+
+    def test_plan_sprints(self):
+        # When
+        measured = self._profile("plan_sprints")
+
+        # Then
+        self.assertEqual([["JAT-003", "JAT-004"], ["JAT-006"]], [sprint["issues"] for sprint in measured["result"]])
+        self.assertEqual(5, measured["requests"])
+
+    def test_export_an_epic(self):
+        # When
+        measured = self._profile("export_epic")
+
+        # Then
+        self.assertEqual(120, measured["result"])
+        self.assertEqual(4, measured["requests"])
+
+    def test_add_labels_to_the_issues_of_an_epic(self):
+        # When
+        measured = self._profile("labels_of_epic")
+
+        # Then
+        self.assertEqual(10, measured["requests"])
+
+    def test_add_labels_to_the_issues_of_several_epics(self):
+        # When
+        measured = self._profile("labels_of_epics")
+
+        # Then
+        self.assertEqual(14, measured["requests"])
+
+    def test_copy_the_fix_versions_of_an_epic(self):
+        # When
+        measured = self._profile("fix_version_of_epic")
+
+        # Then
+        self.assertEqual(11, measured["requests"])
+
+    def test_copy_the_fix_versions_of_several_epics(self):
+        # When
+        measured = self._profile("fix_versions_of_epics")
+
+        # Then
+        self.assertEqual(17, measured["requests"])
+
+
+if __name__ == "__main__":
+    # python tests/test_replay.py [cassette name ...] records the cassettes of the baselines again
+    record_baselines(sys.argv[1:])
@@ -0,0 +1,105 @@
+import unittest
+from unittest.mock import Mock, call
+
+import jira
+from lib_for_tests import DEFAULT_FIELDS_RETURN_VALUE
+
+from jira_agile_toolbox import JiraAgileToolBox
+from jira_agile_toolbox.cache import EpicCache
+
+
+def _backlog_page(story_points, first_number=1, total=None):
+    issues = [
+        {"key": f"JAT-{number:03d}", "fields": {"customfield_10282": points}}
+        for number, points in enumerate(story_points, start=first_number)
+    ]
+    return {"startAt": first_number - 1, "total": total if total is not None else len(issues), "issues": issues}
+
+
+class TestPlanSprints(unittest.TestCase):
+    def setUp(self) -> None:
+        self.jira_client = Mock(spec=jira.JIRA)
+        self.jira_client.fields.return_value = DEFAULT_FIELDS_RETURN_VALUE
+        self.jat = JiraAgileToolBox(self.jira_client)
+
+    def test_sprints_are_filled_in_rank_order_until_their_capacity_is_reached(self):
+        # Given
+        self.jira_client.search_issues.return_value = _backlog_page([3, 5, None, 4, 2, 8, 1])
+
+        # When
+        plan = self.jat.plan_sprints("JAT", [10, 6, 10])
+
+        # Then
+        self.assertEqual(
+            [
+                {"issues": ["JAT-001", "JAT-002", "JAT-003"], "story_points": 8, "capacity": 10},
+                {"issues": ["JAT-004", "JAT-005"], "story_points": 6, "capacity": 6},
+                {"issues": ["JAT-006", "JAT-007"], "story_points": 9, "capacity": 10},
+            ],
+            plan,
+        )
+        self.jira_client.search_issues.assert_called_once_with(
+            "project = JAT AND statusCategory != Done AND (sprint is EMPTY OR sprint not in (openSprints(), futureSprints())) "
+            "ORDER BY Rank ASC",
+            startAt=0,
+            maxResults=100,
+            fields=["customfield_10282"],
+            json_result=True,
+        )
+
+    def test_an_issue_which_does_not_fit_is_tried_in_the_next_sprint(self):
+        # Given
+        self.jira_client.search_issues.return_value = _backlog_page([2, 13, 1])
+
+        # When
+        plan = self.jat.plan_sprints("JAT", [5, 5, 20], jql_query="component = backend")
+
+        # Then
+        self.assertEqual([["JAT-001"], [], ["JAT-002", "JAT-003"]], [sprint["issues"] for sprint in plan])
+        self.assertEqual(
+            "project = JAT AND statusCategory != Done AND (sprint is EMPTY OR sprint not in (openSprints(), futureSprints())) "
+            "AND component = backend ORDER BY Rank ASC",
+            self.jira_client.search_issues.call_args[0][0],
+        )
+
+    def test_the_backlog_is_only_read_as_far_as_the_capacity_reaches(self):
+        # Given
+        self.jira_client.search_issues.side_effect = [
+            _backlog_page([5] * 100, total=300),
+            _backlog_page([5] * 100, first_number=101, total=300),
+        ]
+
+        # When
+        plan = self.jat.plan_sprints("JAT", [400, 400])
+
+        # Then
+        self.assertEqual([80, 80], [len(sprint["issues"]) for sprint in plan])
+        self.assertEqual(2, self.jira_client.search_issues.call_count)
+
+    def test_the_plan_is_applied_with_batched_sprint_moves(self):
+        # Given
+        self.jira_client.search_issues.return_value = _backlog_page([1] * 60)
+        cache = EpicCache()
+        cache.put("JAT-100", None, "", [Mock(key="JAT-001")])
+        self.jat._cache = cache
+
+        # When
+        plan = self.jat.plan_sprints("JAT", [55, 10], sprint_ids=[31, 32])
+
+        # Then
+        self.assertEqual([31, 32], [sprint["sprint_id"] for sprint in plan])
+        self.assertEqual(
+            [
+                call(31, [f"JAT-{number:03d}" for number in range(1, 51)]),
+                call(31, [f"JAT-{number:03d}" for number in range(51, 56)]),
+                call(32, [f"JAT-{number:03d}" for number in range(56, 61)]),
+            ],
+            self.jira_client.add_issues_to_sprint.call_args_list,
+        )
+        self.assertEqual(0, len(cache))
+
+    def test_one_sprint_id_is_needed_per_capacity(self):
+        # When / Then
+        with self.assertRaises(ValueError):
+            self.jat.plan_sprints("JAT", [10, 10], sprint_ids=[31])
+        self.jira_client.search_issues.assert_not_called()
@@ -0,0 +1,121 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import jira
+from lib_for_tests import DEFAULT_FIELDS_RETURN_VALUE, MockedJiraIssue
+
+from jira_agile_toolbox import JiraAgileToolBox
+from jira_agile_toolbox.single_flight import SingleFlight
+
+THREADS = 8
+
+
+def _blocking(release, return_value):
+    def call(*args, **kwargs):
+        release.wait(5)
+        return return_value
+
+    return call
+
+
+def _run_concurrently(function, release):
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        futures = [executor.submit(function) for _ in range(THREADS)]
+        # give every thread the time to join the call which is blocked
+        time.sleep(0.2)
+        release.set()
+        return [future.result() for future in futures]
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_calls_with_the_same_key_which_run_at_the_same_time_share_one_call(self):
+        # Given
+        release = threading.Event()
+        function = Mock(side_effect=_blocking(release, ["JAT-001"]))
+        single_flight = SingleFlight()
+
+        # When
+        results = _run_concurrently(lambda: single_flight.do("key", function, "argument"), release)
+
+        # Then
+        function.assert_called_once_with("argument")
+        self.assertEqual([["JAT-001"]] * THREADS, results)
+        self.assertEqual(THREADS, len({id(result) for result in results}))
+
+    def test_the_error_of_the_shared_call_is_raised_in_every_thread(self):
+        # Given
+        release = threading.Event()
+
+        def failing_call():
+            release.wait(5)
+            raise ValueError("search failed")
+
+        single_flight = SingleFlight()
+
+        # When / Then
+        with self.assertRaises(ValueError):
+            _run_concurrently(lambda: single_flight.do("key", failing_call), release)
+
+    def test_calls_which_do_not_overlap_are_not_shared(self):
+        # Given
+        function = Mock(return_value=1)
+        single_flight = SingleFlight()
+
+        # When
+        single_flight.do("key", function)
+        single_flight.do("key", function)
+
+        # Then
+        self.assertEqual(2, function.call_count)
+
+
+class TestSharedToolbox(unittest.TestCase):
+    def setUp(self) -> None:
+        self.jira_client = Mock(spec=jira.JIRA)
+        self.jat = JiraAgileToolBox(self.jira_client)
+
+    def test_the_story_points_field_is_looked_up_once_by_concurrent_threads(self):
+        # Given
+        release = threading.Event()
+        self.jira_client.fields.side_effect = _blocking(release, DEFAULT_FIELDS_RETURN_VALUE)
+
+        # When
+        results = _run_concurrently(self.jat._get_story_points_custom_field, release)
+
+        # Then
+        self.jira_client.fields.assert_called_once_with()
+        self.assertEqual(["customfield_10282"] * THREADS, results)
+
+    def test_identical_epic_searches_in_flight_share_one_request(self):
+        # Given
+        release = threading.Event()
+        issue = MockedJiraIssue(3)
+        self.jira_client.search_issues.side_effect = _blocking(release, [issue])
+
+        # When
+        results = _run_concurrently(lambda: self.jat.get_all_issues_in_epic("JAT-001", fields=["status"]), release)
+
+        # Then
+        self.jira_client.search_issues.assert_called_once_with("'parentEpic' = JAT-001", fields=["status"], maxResults=0)
+        self.assertEqual([[issue]] * THREADS, results)
+
+    def test_searches_with_other_fields_are_not_shared(self):
+        # Given
+        release = threading.Event()
+        self.jira_client.search_issues.side_effect = _blocking(release, [])
+        fields = iter([["status"], ["labels"]] * THREADS)
+        lock = threading.Lock()
+
+        def search():
+            with lock:
+                fields_to_get = next(fields)
+            return self.jat.get_all_issues_in_epic("JAT-001", fields=fields_to_get)
+
+        # When
+        _run_concurrently(search, release)
+
+        # Then
+        self.assertEqual(2, self.jira_client.search_issues.call_count)
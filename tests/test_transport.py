@@ -0,0 +1,112 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import jira
+import requests
+from lib_for_tests import LocalJsonServer
+
+from jira_agile_toolbox import JiraAgileToolBox
+from jira_agile_toolbox.transport import PooledHTTPAdapter, build_jira_client, get_pooled_adapter, tune_session
+
+
+class TestTuneSession(unittest.TestCase):
+    def test_tune_session_mounts_a_pooled_adapter_for_http_and_https(self):
+        # Given
+        session = requests.Session()
+
+        # When
+        adapter = tune_session(session, pool_size=25)
+
+        # Then
+        self.assertIs(adapter, session.get_adapter("https://jira.example.com"))
+        self.assertIs(adapter, session.get_adapter("http://jira.example.com"))
+        self.assertEqual(25, adapter.stats()["pool_size"])
+
+    def test_tune_session_negotiates_compressed_kept_alive_responses(self):
+        # Given
+        session = requests.Session()
+
+        # When
+        tune_session(session)
+
+        # Then
+        self.assertEqual("gzip, deflate", session.headers["Accept-Encoding"])
+        self.assertEqual("keep-alive", session.headers["Connection"])
+
+    def test_connections_are_reused_between_requests(self):
+        # Given
+        session = requests.Session()
+        adapter = tune_session(session, pool_size=2)
+
+        # When
+        with LocalJsonServer() as server:
+            for _ in range(5):
+                session.get(server.url)
+
+        # Then
+        stats = adapter.stats()
+        self.assertEqual(5, stats["requests"])
+        self.assertEqual(1, stats["connections_opened"])
+        self.assertEqual(4, stats["connections_reused"])
+        self.assertEqual(0, stats["pool_exhausted"])
+
+    def test_requests_beyond_the_pool_size_are_counted_as_pool_exhaustion(self):
+        # Given
+        adapter = PooledHTTPAdapter(pool_size=1)
+        in_flight_counts = []
+
+        def fake_send(request, **kwargs):
+            in_flight_counts.append(adapter._in_flight)
+            if len(in_flight_counts) == 1:
+                adapter.send(request, **kwargs)
+
+        # When
+        with patch("requests.adapters.HTTPAdapter.send", side_effect=fake_send):
+            adapter.send(Mock())
+
+        # Then
+        self.assertEqual(1, adapter.stats()["pool_exhausted"])
+
+    def test_concurrent_requests_within_the_pool_size_do_not_exhaust_the_pool(self):
+        # Given
+        session = requests.Session()
+        adapter = tune_session(session, pool_size=4)
+
+        # When
+        with LocalJsonServer() as server:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(lambda _: session.get(server.url), range(20)))
+
+        # Then
+        stats = adapter.stats()
+        self.assertEqual(20, stats["requests"])
+        self.assertLessEqual(stats["connections_opened"], 4)
+        self.assertEqual(0, stats["pool_exhausted"])
+
+
+class TestBuildJiraClient(unittest.TestCase):
+    def test_build_jira_client_sizes_the_pool_to_max_workers(self):
+        # When
+        jira_client = build_jira_client("https://jira.example.com", max_workers=16, get_server_info=False)
+
+        # Then
+        self.assertIsInstance(jira_client, jira.JIRA)
+        self.assertEqual(16, get_pooled_adapter(jira_client._session).stats()["pool_size"])
+
+    def test_toolbox_from_server_exposes_the_transport_stats(self):
+        # When
+        jat = JiraAgileToolBox.from_server("https://jira.example.com", max_workers=12, get_server_info=False)
+
+        # Then
+        self.assertEqual(
+            {"pool_size": 12, "requests": 0, "connections_opened": 0, "connections_reused": 0, "pool_exhausted": 0},
+            jat.transport_stats(),
+        )
+
+    def test_transport_stats_is_none_for_an_untuned_client(self):
+        # Given
+        jat = JiraAgileToolBox(Mock(spec=jira.JIRA))
+
+        # Then
+        self.assertIsNone(jat.transport_stats())
@@ -0,0 +1,177 @@
+import hashlib
+import hmac
+import json
+import unittest
+import urllib.error
+import urllib.request
+from unittest.mock import Mock
+
+import jira
+from lib_for_tests import DEFAULT_FIELDS_RETURN_VALUE, MockedJiraIssue
+
+from jira_agile_toolbox import JiraAgileToolBox
+from jira_agile_toolbox.cache import EpicCache
+from jira_agile_toolbox.webhook import WebhookReceiver
+
+# trimmed versions of payloads recorded from a jira server
+ISSUE_UPDATED = {
+    "timestamp": 1634567890123,
+    "webhookEvent": "jira:issue_updated",
+    "issue_event_type_name": "issue_generic",
+    "user": {"name": "jneefs", "displayName": "Jef Neefs"},
+    "issue": {
+        "id": "67",
+        "self": "https://jira.example.com/rest/api/2/issue/67",
+        "key": "PROJ001-002",
+        "fields": {
+            "summary": "a story",
+            "status": {"name": "Closed", "id": "6"},
+            "customfield_10282": 3.0,
+            "customfield_10008": "PROJ001-001",
+        },
+    },
+    "changelog": {
+        "id": "1001",
+        "items": [{"field": "status", "fieldtype": "jira", "from": "1", "fromString": "Reported", "to": "6", "toString": "Closed"}],
+    },
+}
+ISSUE_MOVED_TO_OTHER_EPIC = {
+    "webhookEvent": "jira:issue_updated",
+    "issue": {"id": "68", "key": "PROJ001-003", "fields": {"summary": "another story", "customfield_10008": "PROJ001-010"}},
+    "changelog": {
+        "items": [
+            {"field": "Epic Link", "fieldtype": "custom", "from": "60", "fromString": "PROJ001-001", "to": "61", "toString": "PROJ001-010"}
+        ]
+    },
+}
+ISSUE_CREATED = {
+    "webhookEvent": "jira:issue_created",
+    "issue": {"id": "70", "key": "PROJ001-020", "fields": {"summary": "new story", "customfield_10008": "PROJ001-001", "labels": []}},
+}
+ISSUE_DELETED = {
+    "webhookEvent": "jira:issue_deleted",
+    "issue": {"id": "67", "key": "PROJ001-002", "fields": {"summary": "a story"}},
+}
+
+
+def _issue(key, story_points=1, status="Reported"):
+    issue = MockedJiraIssue(story_points, status)
+    issue.key = key
+    return issue
+
+
+class TestWebhookReceiver(unittest.TestCase):
+    def setUp(self) -> None:
+        self.jira_client = Mock(spec=jira.JIRA)
+        self.jira_client.fields.return_value = DEFAULT_FIELDS_RETURN_VALUE
+        self.cache = EpicCache()
+        self.jat = JiraAgileToolBox(self.jira_client, cache=self.cache)
+        self.epic1_issues = [_issue("PROJ001-002"), _issue("PROJ001-003")]
+        self.epic10_issues = [_issue("PROJ001-011")]
+        self.jira_client.search_issues.side_effect = lambda jql, **kwargs: list(
+            self.epic1_issues if "PROJ001-001" in jql else self.epic10_issues
+        )
+        self.jat.get_storypoints_from_epic("PROJ001-001")
+        self.jat.get_all_issues_in_epic("PROJ001-010")
+        self.jira_client.search_issues.reset_mock()
+
+    def _post(self, receiver, payload, headers=None):
+        request = urllib.request.Request(receiver.url, data=json.dumps(payload).encode(), headers=headers or {}, method="POST")
+        with urllib.request.urlopen(request) as response:
+            return response.status
+
+    def test_cached_searches_are_served_without_asking_jira(self):
+        # When
+        self.jat.get_storypoints_from_epic("PROJ001-001")
+        self.jat.get_all_issues_in_epic("PROJ001-010")
+
+        # Then
+        self.jira_client.search_issues.assert_not_called()
+
+    def test_an_updated_issue_invalidates_the_searches_which_found_it(self):
+        # Given
+        self.epic1_issues = [_issue("PROJ001-002", status="Closed"), _issue("PROJ001-003")]
+
+        # When
+        with WebhookReceiver(self.cache) as receiver:
+            status = self._post(receiver, ISSUE_UPDATED)
+
+        # Then
+        self.assertEqual(204, status)
+        self.assertEqual({"total": 2, "Closed": 1, "Reported": 1}, self.jat.get_storypoints_from_epic("PROJ001-001"))
+        self.jat.get_all_issues_in_epic("PROJ001-010")
+        self.jira_client.search_issues.assert_called_once()
+
+    def test_an_issue_moving_to_another_epic_invalidates_both_epics(self):
+        # When
+        with WebhookReceiver(self.cache) as receiver:
+            self._post(receiver, ISSUE_MOVED_TO_OTHER_EPIC)
+
+        # Then
+        self.assertEqual({"PROJ001-001", "PROJ001-010"} & self.cache.epics(), set())
+
+    def test_a_created_issue_invalidates_the_epic_it_belongs_to(self):
+        # When
+        with WebhookReceiver(self.cache) as receiver:
+            self._post(receiver, ISSUE_CREATED)
+
+        # Then
+        self.assertEqual({"PROJ001-010"}, self.cache.epics())
+
+    def test_a_deleted_issue_is_removed_from_the_cached_searches(self):
+        # When
+        with WebhookReceiver(self.cache) as receiver:
+            self._post(receiver, ISSUE_DELETED)
+
+        # Then
+        self.assertEqual(
+            ["PROJ001-003"], [issue.key for issue in self.jat.get_all_issues_in_epic("PROJ001-001", ["customfield_10282", "status"])]
+        )
+        self.jira_client.search_issues.assert_not_called()
+
+    def test_unsigned_payloads_are_rejected_when_a_secret_is_configured(self):
+        # When
+        with WebhookReceiver(self.cache, secret="s3cr3t") as receiver:
+            with self.assertRaises(urllib.error.HTTPError) as context:
+                self._post(receiver, ISSUE_DELETED, headers={"X-Hub-Signature": "sha256=forged"})
+
+        # Then
+        self.assertEqual(401, context.exception.code)
+        self.assertEqual(2, len(self.cache))
+
+    def test_signed_payloads_are_accepted_when_a_secret_is_configured(self):
+        # Given
+        body = json.dumps(ISSUE_DELETED).encode()
+        signature = "sha256=" + hmac.new(b"s3cr3t", body, hashlib.sha256).hexdigest()
+
+        # When
+        with WebhookReceiver(self.cache, secret="s3cr3t") as receiver:
+            request = urllib.request.Request(receiver.url, data=body, headers={"X-Hub-Signature": signature}, method="POST")
+            with urllib.request.urlopen(request) as response:
+                status = response.status
+
+        # Then
+        self.assertEqual(204, status)
+
+    def test_invalid_json_is_rejected(self):
+        # When
+        with WebhookReceiver(self.cache) as receiver:
+            request = urllib.request.Request(receiver.url, data=b"not json", method="POST")
+            with self.assertRaises(urllib.error.HTTPError) as context:
+                urllib.request.urlopen(request)
+
+        # Then
+        self.assertEqual(400, context.exception.code)
+        self.assertEqual(2, len(self.cache))
+
+    def test_other_events_leave_the_cache_alone(self):
+        # Given
+        receiver = WebhookReceiver(self.cache)
+        self.addCleanup(receiver.stop)
+
+        # When
+        result = receiver.handle_event({"webhookEvent": "sprint_started", "sprint": {"id": 1}})
+
+        # Then
+        self.assertEqual([], result)
+        self.assertEqual(2, len(self.cache))